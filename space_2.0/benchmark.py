@@ -0,0 +1,260 @@
+"""Benchmarks de estrés para Game.update, Game.check_collisions y Game.draw.
+
+Uso:
+    python benchmark.py                          # todos los escenarios
+    python benchmark.py -s bullets_10k -f 600    # un escenario, 600 frames
+    python benchmark.py -o actual.json -c base.json
+    python benchmark.py --endless 20             # FPS sostenidos por oleada del modo infinito
+
+Los resultados (media, p95 y p99 en ms por frame y fase) se guardan en JSON
+para compararlos entre commits.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from game.game import Game
+from game.enemy import BasicEnemy, StrongEnemy
+from game.cloud import Cloud
+from game.satellite import Satellite
+from game.bullets import KIND_RECT, KIND_LASER, KIND_ORB
+from game.input import InputState, ScriptedInput
+from game.waves import WaveStats
+
+PHASES = ('update', 'check_collisions', 'draw')
+
+
+def scenario_enemies_500(game):
+    """500 enemigos básicos y fuertes en formación."""
+    enemies = []
+    for i in range(500):
+        row, col = divmod(i, 25)
+        cls = BasicEnemy if (row + col) % 2 == 0 else StrongEnemy
+        enemies.append(cls(20 + col * 28, 10 + row * 12, bullet_speed=3, level=2))
+    game.set_enemies(enemies)
+    return None
+
+
+def scenario_bullets_10k(game):
+    """Nivel 2 con 10.000 balas enemigas vivas en todo momento."""
+    game.current_level = 2
+    game.load_level_background()
+    game.create_enemies()
+    rng = np.random.default_rng(game.seed)
+    kinds = (KIND_RECT, KIND_LASER, KIND_ORB)
+    colors = ((255, 0, 0), (255, 0, 255), (255, 165, 0))
+
+    def refill():
+        missing = 10000 - game.bullets.count
+        if missing <= 0:
+            return
+        per_kind = missing // len(kinds) + 1
+        for kind, color in zip(kinds, colors):
+            size = (12, 12) if kind == KIND_ORB else (4, 16)
+            game.bullets.spawn_many(
+                rng.uniform(0, game.screen_width, per_kind),
+                rng.uniform(0, game.screen_height, per_kind),
+                rng.uniform(-2, 2, per_kind),
+                rng.uniform(1, 5, per_kind),
+                size[0], size[1], kind, color, 1_000_000,
+            )
+    return refill
+
+
+def scenario_full_sky(game):
+    """Cielo lleno de nubes y satélites sobre el nivel 3."""
+    game.current_level = 3
+    game.load_level_background()
+    game.create_enemies()
+    game.level_manager.levels[3].clouds = True
+
+    def refill():
+        while len(game.clouds) < 40:
+            game.clouds.append(Cloud(game.screen_width, game.screen_height, game.rng))
+        while len(game.satellites) < 20:
+            game.satellites.append(Satellite(game.screen_width, game.screen_height, game.rng))
+    return refill
+
+
+def scenario_boss_fight(game):
+    """Jefe final con 60 minions RadialEnemy disparando ráfagas."""
+    minions = game.level_manager.levels[3].groups[1]
+    minions.types = minions.types[:1] * 60
+    game.current_level = 3
+    game.load_level_background()
+    game.create_enemies()
+    return None
+
+
+SCENARIOS = {
+    'enemies_500': scenario_enemies_500,
+    'bullets_10k': scenario_bullets_10k,
+    'full_sky': scenario_full_sky,
+    'boss_fight': scenario_boss_fight,
+}
+
+
+def summarize(samples):
+    values = np.sort(np.asarray(samples, dtype=np.float64) * 1000.0)
+    if values.size == 0:
+        return {'mean': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'mean': float(values.mean()),
+        'p95': float(np.percentile(values, 95)),
+        'p99': float(np.percentile(values, 99)),
+        'max': float(values[-1]),
+    }
+
+
+def run_scenario(name, frames, seed, dirty_rects=False):
+    game = Game(headless=True, seed=seed, dirty_rects=dirty_rects)
+    refill = SCENARIOS[name](game)
+    game.level_banner.hide()
+
+    samples = {phase: [] for phase in PHASES}
+    frame_samples = []
+    collision_time = [0.0]
+    check_collisions = game.check_collisions
+
+    def timed_check_collisions():
+        start = time.perf_counter()
+        result = check_collisions()
+        collision_time[0] += time.perf_counter() - start
+        return result
+    game.check_collisions = timed_check_collisions
+
+    for _ in range(frames):
+        if refill:
+            refill()
+        # El benchmark mide el coste por frame, no la partida: el jugador nunca pierde
+        game.game_over = False
+        game.victory = False
+        game.player.lives = 5
+        collision_time[0] = 0.0
+
+        start = time.perf_counter()
+        game.update()
+        update_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        game.draw()
+        draw_time = time.perf_counter() - start
+
+        samples['update'].append(update_time - collision_time[0])
+        samples['check_collisions'].append(collision_time[0])
+        samples['draw'].append(draw_time)
+        frame_samples.append(update_time + draw_time)
+
+    result = {phase: summarize(values) for phase, values in samples.items()}
+    result['frame'] = summarize(frame_samples)
+    result['entities'] = {
+        'enemies': len(game.enemies),
+        'bullets': game.bullets.count,
+        'clouds': len(game.clouds),
+        'satellites': len(game.satellites),
+    }
+    return result
+
+
+def run_endless(waves, frames, seed, dirty_rects=False):
+    """Oleadas 1..`waves` del modo infinito, `frames` frames cada una, con el jugador disparando.
+
+    Cada frame es un tick de update más un draw sin esperar al reloj, así que los
+    FPS del informe son los que daría la máquina sin límite: por debajo de 60 la
+    oleada ya no cabe en el presupuesto de frame.
+    """
+    shooting = ScriptedInput(itertools.repeat(InputState(shoot=True)))
+    game = Game(headless=True, seed=seed, dirty_rects=dirty_rects, endless=True, input_source=shooting)
+    stats = WaveStats()
+    for wave in range(1, waves + 1):
+        game.current_level = wave
+        game.load_level_background()
+        game.create_enemies()
+        game.level_banner.hide()
+        for _ in range(frames):
+            game.game_over = False
+            game.player.lives = 5
+            start = time.perf_counter()
+            game.update()
+            game.draw()
+            stats.frame(time.perf_counter() - start)
+        report = stats.finish(wave, game.wave_size)
+        if report:  # con -f 0 no hay frames medidos
+            print(WaveStats.format(report))
+    return stats.reports
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def print_results(results, baseline=None):
+    for name, result in results['scenarios'].items():
+        print(f"\n{name}  ({result['entities']})")
+        for phase in PHASES + ('frame',):
+            stats = result[phase]
+            line = f"  {phase:<17} media {stats['mean']:8.3f} ms   p95 {stats['p95']:8.3f} ms   p99 {stats['p99']:8.3f} ms"
+            if baseline and name in baseline.get('scenarios', {}):
+                before = baseline['scenarios'][name][phase]['mean']
+                if before > 0:
+                    line += f"   ({(stats['mean'] - before) / before * 100:+.1f}% vs base)"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de estrés de Invasión Espacial")
+    parser.add_argument('-s', '--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="escenario a ejecutar (se puede repetir); por defecto todos")
+    parser.add_argument('-f', '--frames', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="dibujar con el modo de rectángulos sucios")
+    parser.add_argument('--endless', type=int, metavar='OLEADAS',
+                        help="medir las primeras OLEADAS oleadas del modo infinito en vez de los escenarios")
+    parser.add_argument('-o', '--output', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('-c', '--compare', help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'frames': args.frames,
+        'seed': args.seed,
+        'dirty_rects': args.dirty_rects,
+        'scenarios': {},
+    }
+    if args.endless:
+        results['endless'] = run_endless(args.endless, args.frames, args.seed, args.dirty_rects)
+    else:
+        for name in args.scenario or SCENARIOS:
+            results['scenarios'][name] = run_scenario(name, args.frames, args.seed, args.dirty_rects)
+
+        baseline = None
+        if args.compare:
+            with open(args.compare, 'r') as f:
+                baseline = json.load(f)
+        print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+import pygame
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGES_DIR = os.path.join(BASE_DIR, 'images')
+SOUNDS_DIR = os.path.join(BASE_DIR, 'sounds')
+LEVELS_DIR = os.path.join(BASE_DIR, 'levels')
+LEVEL_CACHE_DIR = os.path.join(BASE_DIR, '.level_cache')  # planes de nivel compilados
+
+
+class SpriteCache:
+    """Caché compartida de imágenes ya escaladas, con límite de memoria y política LRU.
+
+    Las entradas se indexan por (archivo, tamaño, flags) para que todas las entidades
+    que usan la misma imagen compartan una única superficie. Los originales de los que
+    se escalan van aparte (`sources`, las últimas `max_sources`): no cuentan en las
+    estadísticas ni en el presupuesto de memoria.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_sources=8):
+        self.max_bytes = max_bytes
+        self.max_sources = max_sources
+        self.entries = OrderedDict()  # clave -> (superficie, bytes)
+        self.sources = OrderedDict()  # (archivo, alpha) -> imagen original sin escalar
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pending = {}  # (archivo, tamaño) -> Future con la imagen leída en segundo plano
+        self.executor = None
+
+    def prefetch(self, images):
+        """Lee del disco (y escala) `images` en un hilo de fondo para que `load` no bloquee después.
+
+        Cada elemento es un nombre de archivo (la imagen original) o un par (archivo,
+        tamaño). Se salta cada tamaño ya cacheado o pedido antes, y todos los tamaños
+        nuevos de un mismo archivo comparten una sola lectura. El hilo solo decodifica y
+        escala; la conversión al formato de pantalla se hace en el hilo principal la
+        primera vez que se pide cada tamaño.
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='prefetch')
+        requested = {}
+        for item in images:
+            image_name, size = (item, None) if isinstance(item, str) else item
+            size = tuple(size) if size else None
+            if (image_name, size) not in self.pending and not self._cached(image_name, size):
+                requested.setdefault(image_name, set()).add(size)
+        for image_name, sizes in requested.items():
+            path = os.path.join(IMAGES_DIR, image_name)
+            future = self.executor.submit(_read_image, path, sizes - {None})
+            for size in sizes:
+                self.pending[image_name, size] = future
+
+    def _cached(self, image_name, size):
+        if size is None and any((image_name, alpha) in self.sources for alpha in (True, False)):
+            return True
+        return any((image_name, size, alpha, False) in self.entries for alpha in (True, False))
+
+    def load(self, image_name, size=None, alpha=True, flip_x=False, fallback_color=(255, 0, 0)):
+        """Devuelve la superficie de `image_name` escalada a `size`.
+
+        La superficie devuelta es compartida: quien necesite modificarla debe copiarla.
+        """
+        key = (image_name, tuple(size) if size else None, alpha, flip_x)
+        surface = self._get(key)
+        if surface is not None:
+            return surface
+
+        prepared = self._prefetched(image_name, size) if size and not flip_x else None
+        if prepared is not None:
+            surface = prepared.convert_alpha() if alpha else prepared.convert()
+        elif size is None and not flip_x:
+            surface = self._decode(image_name, alpha, fallback_color)
+        else:
+            # Partimos de la imagen original (guardada aparte) para no decodificar de nuevo
+            surface = self._source(image_name, alpha, fallback_color)
+            if size:
+                surface = pygame.transform.scale(surface, size)
+            if flip_x:
+                surface = pygame.transform.flip(surface, True, False)
+        self._put(key, surface)
+        return surface
+
+    def build(self, key, builder):
+        """Devuelve la superficie derivada `key`, generándola con `builder()` solo la primera vez.
+
+        Sirve para sprites que no vienen de un archivo (proyectiles, tintes, brillos...).
+        """
+        surface = self._get(key)
+        if surface is None:
+            surface = builder()
+            self._put(key, surface)
+        return surface
+
+    def _source(self, image_name, alpha, fallback_color):
+        """Imagen original de la que se sacan las versiones escaladas o volteadas, sin pasar por el LRU."""
+        entry = self.entries.get((image_name, None, alpha, False))
+        if entry is not None:
+            return entry[0]
+        key = (image_name, alpha)
+        surface = self.sources.get(key)
+        if surface is not None:
+            self.sources.move_to_end(key)
+            return surface
+        # Entidades de tamaño aleatorio (nubes, satélites) reescalan el mismo original a menudo
+        surface = self.sources[key] = self._decode(image_name, alpha, fallback_color)
+        while len(self.sources) > self.max_sources:
+            self.sources.popitem(last=False)
+        return surface
+
+    def _prefetched(self, image_name, size):
+        """Versión ya escalada en segundo plano de `image_name`, si se pidió ese tamaño.
+
+        Solo se retira de `pending` el tamaño servido: los demás siguen esperando en la
+        misma lectura.
+        """
+        future = self.pending.pop((image_name, tuple(size)), None)
+        if future is None:
+            return None
+        try:
+            _, scaled = future.result()
+        except Exception:
+            return None
+        return scaled.get(tuple(size))
+
+    def _decode(self, image_name, alpha, fallback_color):
+        path = os.path.join(IMAGES_DIR, image_name)
+        future = self.pending.pop((image_name, None), None)
+        try:
+            image = future.result()[0] if future else pygame.image.load(path)
+            return image.convert_alpha() if alpha else image.convert()
+        except Exception as e:
+            print(f"Error cargando imagen {path}: {e}")
+            placeholder = pygame.Surface((50, 50))
+            placeholder.fill(fallback_color)
+            return placeholder
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def _put(self, key, surface):
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.entries[key] = (surface, size)
+        self.memory += size
+        self._evict()
+
+    def _evict(self):
+        # Nunca eliminamos la entrada recién insertada aunque por sí sola supere el límite
+        while self.memory > self.max_bytes and len(self.entries) > 1:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.memory -= size
+            self.evictions += 1
+
+    def clear(self):
+        self.pending.clear()
+        self.entries.clear()
+        self.sources.clear()
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'memory': self.memory,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def _read_image(path, sizes):
+    """Trabajo del hilo de prefetch: imagen original y sus versiones escaladas a `sizes`."""
+    image = pygame.image.load(path)
+    return image, {size: pygame.transform.scale(image, size) for size in sizes}
+
+
+def tinted(surface, color, special_flags):
+    """Copia de `surface` con `fill(color, special_flags)` aplicado (tintes, transparencias, brillos)."""
+    result = surface.copy()
+    result.fill(color, special_flags=special_flags)
+    return result
+
+
+class AnimatedBackground:
+    """GIF animado decodificado y escalado una sola vez, reproducido desde la caché.
+
+    Los frames escalados viven en `sprite_cache`, así que cualquier pantalla que muestre
+    el mismo GIF al mismo tamaño reutiliza las mismas superficies.
+    """
+
+    def __init__(self, image_name, size, cache=None):
+        self.image_name = image_name
+        self.size = tuple(size)
+        self.cache = cache or sprite_cache
+        self.frames = []
+        self.durations = []
+        self.total_duration = 0.0
+        self.start = pygame.time.get_ticks()
+        self._load()
+
+    def _load(self):
+        import gif_pygame
+
+        path = os.path.join(IMAGES_DIR, self.image_name)
+        try:
+            gif = gif_pygame.load(path)
+            surfaces = gif.get_surfaces()
+            durations = gif.get_durations()
+        except Exception as e:
+            print(f"Error cargando GIF {path}: {e}")
+            surfaces, durations = [], []
+
+        for index, surface in enumerate(surfaces):
+            key = ('gif', self.image_name, self.size, index)
+            self.frames.append(self.cache.build(
+                key, lambda surface=surface: pygame.transform.scale(surface, self.size).convert()))
+        if not self.frames:
+            placeholder = pygame.Surface(self.size)
+            placeholder.fill((0, 0, 0))
+            self.frames.append(placeholder)
+            durations = [1.0]
+        # Los GIF sin retardo se reproducen a 10 FPS, como hacen los navegadores
+        self.durations = [d if d > 0 else 0.1 for d in durations[:len(self.frames)]]
+        self.total_duration = sum(self.durations)
+
+    def frame(self, now=None):
+        """Frame que corresponde al tiempo transcurrido (en ms de `pygame.time.get_ticks`)."""
+        if len(self.frames) == 1:
+            return self.frames[0]
+        now = pygame.time.get_ticks() if now is None else now
+        elapsed = ((now - self.start) / 1000.0) % self.total_duration
+        for surface, duration in zip(self.frames, self.durations):
+            if elapsed < duration:
+                return surface
+            elapsed -= duration
+        return self.frames[-1]
+
+
+sprite_cache = SpriteCache()
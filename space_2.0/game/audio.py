@@ -0,0 +1,223 @@
+import os
+import time
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from .assets import SOUNDS_DIR
+
+# Efectos del juego: nombre lógico -> archivo en sounds/
+EFFECTS = {
+    'click': 'eleccion_menu.mp3',
+    'hover': 'seleccionar_menu.mp3',
+    'damage': 'daño_recibido_prota.mp3',
+    'shoot': 'disparo_protagonista.mp3',
+    'destroyed': 'estructura_destruida.mp3',
+    'death': 'sonido_muerte_prota.mp3',
+}
+
+# Voces simultáneas máximas y separación mínima en segundos entre dos reproducciones
+EFFECT_LIMITS = {
+    'click': (2, 0.05),
+    'hover': (1, 0.05),
+    'damage': (1, 0.25),
+    'shoot': (2, 0.08),
+    'destroyed': (2, 0.1),
+    'death': (1, 0.0),
+}
+
+
+class AudioService:
+    """Efectos de sonido y bus de volumen compartidos por el menú y la partida.
+
+    Cada efecto se decodifica una sola vez (`pygame.mixer.Sound` lo guarda en PCM) y
+    suena en un grupo de canales reservados, con un límite de voces y un tiempo mínimo
+    entre reproducciones por efecto para no saturar el mezclador. El bus guarda los
+    volúmenes general/música/efectos y el silencio.
+    """
+
+    def __init__(self, channels=8, enabled=True):
+        self.enabled = enabled and self._init_mixer()
+        self.volumes = {"general": 0.5, "musica": 0.5, "efectos": 0.5}
+        self.saved_volumes = dict(self.volumes)
+        self.muted = False
+        self.sounds = {}       # efecto -> Sound decodificado
+        self.voices = {}       # efecto -> canales que lo están reproduciendo
+        self.last_played = {}  # efecto -> instante de la última reproducción
+        self.channels = []
+        music_channels = ()
+        if self.enabled:
+            # Canales reservados: los de efectos y, detrás, los dos de la música
+            total = channels + MusicPlayer.CHANNELS
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+            pygame.mixer.set_reserved(total)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            music_channels = [pygame.mixer.Channel(i) for i in range(channels, total)]
+        self.music = MusicPlayer(music_channels)
+        if self.enabled:
+            self.load_effects()
+
+    @staticmethod
+    def _init_mixer():
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            return True
+        except pygame.error as e:
+            print(f"Error iniciando el mezclador de audio: {e}")
+            return False
+
+    def load_effects(self):
+        for name, file_name in EFFECTS.items():
+            if name in self.sounds:
+                continue
+            try:
+                self.sounds[name] = pygame.mixer.Sound(os.path.join(SOUNDS_DIR, file_name))
+            except Exception as e:
+                print(f"Error cargando sonido {file_name}: {e}")
+        self.apply_volumes()
+
+    def play(self, name):
+        """Reproduce el efecto `name` si no supera su límite de voces ni su tiempo mínimo."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        max_voices, cooldown = EFFECT_LIMITS.get(name, (1, 0.0))
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -cooldown) < cooldown:
+            return None
+
+        voices = [channel for channel in self.voices.get(name, ())
+                  if channel.get_busy() and channel.get_sound() is sound]
+        if len(voices) >= max_voices:
+            self.voices[name] = voices
+            return None
+        for channel in self.channels:
+            if not channel.get_busy():
+                channel.play(sound)
+                voices.append(channel)
+                self.voices[name] = voices
+                self.last_played[name] = now
+                return channel
+        return None
+
+    # --- Bus de volumen ---
+
+    def get_volume(self, key):
+        return self.volumes.get(key, 0)
+
+    def set_volume(self, key, value):
+        self.volumes[key] = max(0, min(1, value))
+        self.apply_volumes()
+
+    def music_volume(self):
+        return self.volumes["general"] * self.volumes["musica"]
+
+    def effects_volume(self):
+        return self.volumes["general"] * self.volumes["efectos"]
+
+    def toggle_mute(self):
+        if self.muted:
+            # Restaurar volúmenes
+            self.volumes = dict(self.saved_volumes)
+            self.muted = False
+        else:
+            # Guardar y silenciar todo
+            self.saved_volumes = dict(self.volumes)
+            self.volumes = dict.fromkeys(self.volumes, 0)
+            self.muted = True
+        self.apply_volumes()
+
+    def update(self):
+        """Llamar una vez por frame: arranca las pistas que terminaron de decodificarse."""
+        self.music.update()
+
+    def apply_volumes(self):
+        if not self.enabled:
+            return
+        self.music.set_volume(self.music_volume())
+        for sound in self.sounds.values():
+            sound.set_volume(self.effects_volume())
+
+
+class MusicPlayer:
+    """Música de fondo sin cortes entre pistas.
+
+    Las pistas se decodifican enteras a PCM en un hilo de fondo (`prefetch`) y suenan
+    en dos canales reservados que se alternan: al cambiar de pista la anterior se
+    desvanece mientras entra la nueva (`fade_time` segundos). Nada de esto bloquea el
+    bucle de frames; si se pide una pista que aún se está decodificando, empieza en
+    cuanto esté lista (`update`).
+    """
+
+    CHANNELS = 2
+
+    def __init__(self, channels, fade_time=1.0):
+        self.channels = list(channels)
+        self.enabled = bool(self.channels)
+        self.fade_time = fade_time
+        self.volume = 1.0
+        self.tracks = {}    # archivo -> Future con el Sound decodificado
+        self.executor = None
+        self.current = None  # pista que suena (o que sonará al terminar de decodificarse)
+        self.channel = None  # canal de la pista actual
+        self.waiting = False
+
+    def prefetch(self, file_name):
+        if not self.enabled or not file_name or file_name in self.tracks:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='music')
+        self.tracks[file_name] = self.executor.submit(pygame.mixer.Sound, os.path.join(SOUNDS_DIR, file_name))
+
+    def retain(self, file_names):
+        """Libera las pistas decodificadas que no estén en `file_names` ni suenen ahora."""
+        keep = set(file_names) | {self.current}
+        for file_name in list(self.tracks):
+            if file_name not in keep:
+                del self.tracks[file_name]
+
+    def play(self, file_name):
+        """Cambia a `file_name` con fundido cruzado; no hace nada si ya es la pista actual."""
+        if not self.enabled or file_name == self.current:
+            return
+        self.prefetch(file_name)
+        self.current = file_name
+        self.waiting = True
+        self._fade_out()
+        self.update()
+
+    def stop(self):
+        self.current = None
+        self.waiting = False
+        self._fade_out()
+
+    def _fade_out(self):
+        if self.channel is not None:
+            self.channel.fadeout(int(self.fade_time * 1000))
+            self.channel = None
+
+    def update(self):
+        if not self.waiting:
+            return
+        future = self.tracks.get(self.current)
+        if future is None or not future.done():
+            return
+        self.waiting = False
+        try:
+            sound = future.result()
+        except Exception as e:
+            print(f"Error cargando música {self.current}: {e}")
+            return
+        # El canal libre es el que no acaba de empezar a desvanecerse
+        channel = next((c for c in self.channels if not c.get_busy()), None)
+        if channel is None:
+            # Cambios muy seguidos: se corta el fundido más antiguo
+            channel = self.channels[0]
+            channel.stop()
+        channel.set_volume(self.volume)
+        channel.play(sound, loops=-1, fade_ms=int(self.fade_time * 1000))
+        self.channel = channel
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for channel in self.channels:
+            channel.set_volume(volume)
@@ -0,0 +1,267 @@
+import pygame
+import numpy as np
+from .timestep import FIXED_DT
+from .assets import sprite_cache
+
+# Dueño de las balas del jugador; los enemigos usan su `uid` (siempre > 0)
+PLAYER_OWNER = 0
+
+# Tipos de proyectil (determinan cómo se dibujan y cuándo se eliminan)
+KIND_RECT = 0     # bala rectangular enemiga
+KIND_LASER = 1    # láser fino enemigo
+KIND_ORB = 2      # bala redonda de RadialEnemy
+KIND_PLAYER = 3   # disparo del jugador
+
+# Margen alrededor de cada bala que cubre su brillo al calcular zonas sucias
+DIRTY_MARGIN = 8
+
+
+class BoundsPolicy:
+    """Elimina las balas que salieron por completo por cualquiera de los cuatro bordes."""
+
+    name = 'bounds'
+
+    def __init__(self, width, height, margin=0):
+        self.left = -margin
+        self.top = -margin
+        self.right = width + margin
+        self.bottom = height + margin
+
+    def expired(self, pool, n):
+        x, y = pool.x[:n], pool.y[:n]
+        return ((x + pool.w[:n] < self.left) | (x > self.right)
+                | (y + pool.h[:n] < self.top) | (y > self.bottom))
+
+
+class MaxAgePolicy:
+    """Elimina las balas que superan su edad máxima en segundos (0 = sin límite)."""
+
+    name = 'max_age'
+
+    def expired(self, pool, n):
+        max_age = pool.max_age[:n]
+        return (max_age > 0) & (pool.age[:n] >= max_age)
+
+
+class BulletPool:
+    """Almacén de proyectiles en arreglos planos de NumPy.
+
+    Cada bala ocupa una posición en los arreglos (posición, velocidad, tamaño,
+    color, dueño y tipo). Las balas vivas están siempre compactadas en
+    `[0, count)`, de modo que la actualización, el borrado y el dibujo se hacen
+    en bloque en lugar de objeto por objeto.
+    """
+
+    def __init__(self, policies=(), capacity=1024):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)   # esquina superior izquierda
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.px = np.zeros(capacity, dtype=np.float32)  # posición en el tick anterior (interpolación)
+        self.py = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.w = np.zeros(capacity, dtype=np.float32)
+        self.h = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)  # índice en self.palette
+        self.owner = np.zeros(capacity, dtype=np.int32)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.age = np.zeros(capacity, dtype=np.float32)      # segundos de simulación vividos
+        self.max_age = np.zeros(capacity, dtype=np.float32)  # 0 = sin límite
+
+        self.palette = []
+        self.palette_index = {}
+
+        # Políticas de vida útil y cuántas balas ha eliminado cada una
+        self.policies = list(policies)
+        self.removed = {policy.name: 0 for policy in self.policies}
+
+    def _arrays(self):
+        return ('x', 'y', 'px', 'py', 'vx', 'vy', 'w', 'h', 'color', 'owner', 'kind', 'age', 'max_age')
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in self._arrays():
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def color_id(self, color):
+        color = tuple(color)
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def spawn(self, x, y, vx, vy, width, height, kind, color, owner, max_age=0):
+        self._reserve(1)
+        i = self.count
+        self.x[i] = self.px[i] = x
+        self.y[i] = self.py[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.w[i] = width
+        self.h[i] = height
+        self.color[i] = self.color_id(color)
+        self.owner[i] = owner
+        self.kind[i] = kind
+        self.age[i] = 0
+        self.max_age[i] = max_age
+        self.count += 1
+
+    def spawn_many(self, x, y, vx, vy, width, height, kind, color, owner, max_age=0):
+        """Añade varias balas a la vez; los escalares se repiten para todas."""
+        x, y, vx, vy = np.broadcast_arrays(x, y, vx, vy)
+        n = x.size
+        if n == 0:
+            return
+        self._reserve(n)
+        s = slice(self.count, self.count + n)
+        self.x[s] = self.px[s] = x.ravel()
+        self.y[s] = self.py[s] = y.ravel()
+        self.vx[s] = vx.ravel()
+        self.vy[s] = vy.ravel()
+        self.w[s] = width
+        self.h[s] = height
+        self.color[s] = self.color_id(color)
+        self.owner[s] = owner
+        self.kind[s] = kind
+        self.age[s] = 0
+        self.max_age[s] = max_age
+        self.count += n
+
+    def update(self, dt=FIXED_DT):
+        """Mueve todas las balas un tick en un solo paso y aplica las políticas de vida útil."""
+        n = self.count
+        if n == 0:
+            return
+        self.px[:n] = self.x[:n]
+        self.py[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.age[:n] += dt
+
+        dead = np.zeros(n, dtype=bool)
+        for policy in self.policies:
+            expired = policy.expired(self, n) & ~dead
+            self.removed[policy.name] += int(expired.sum())
+            dead |= expired
+        self.remove(dead)
+
+    def remove(self, dead):
+        """Elimina en bloque las balas marcadas en la máscara `dead` (longitud `count`)."""
+        if not dead.any():
+            return
+        keep = ~dead
+        kept = int(keep.sum())
+        for name in self._arrays():
+            arr = getattr(self, name)
+            arr[:kept] = arr[:self.count][keep]
+        self.count = kept
+
+    def kill_owner(self, owner):
+        self.remove(self.owner[:self.count] == owner)
+
+    def clear(self):
+        self.count = 0
+
+    def count_by_kind(self):
+        counts = np.bincount(self.kind[:self.count], minlength=4)
+        return {
+            'rect': int(counts[KIND_RECT]),
+            'laser': int(counts[KIND_LASER]),
+            'orb': int(counts[KIND_ORB]),
+            'player': int(counts[KIND_PLAYER]),
+        }
+
+    def _draw_positions(self, alpha):
+        n = self.count
+        if alpha >= 1.0:
+            return self.x[:n], self.y[:n]
+        return (self.px[:n] + (self.x[:n] - self.px[:n]) * alpha,
+                self.py[:n] + (self.y[:n] - self.py[:n]) * alpha)
+
+    def dirty_area(self, margin=DIRTY_MARGIN):
+        """Área (en píxeles) que ocupan las balas incluyendo su brillo."""
+        n = self.count
+        return float(((self.w[:n] + 2 * margin) * (self.h[:n] + 2 * margin)).sum())
+
+    def dirty_rects(self, alpha=1.0, margin=DIRTY_MARGIN):
+        """Rectángulos de pantalla que ocupan las balas dibujadas con `alpha`."""
+        x, y = self._draw_positions(alpha)
+        xs = (x - margin).astype(np.int32).tolist()
+        ys = (y - margin).astype(np.int32).tolist()
+        ws = (self.w[:self.count] + 2 * margin).astype(np.int32).tolist()
+        hs = (self.h[:self.count] + 2 * margin).astype(np.int32).tolist()
+        return [pygame.Rect(r) for r in zip(xs, ys, ws, hs)]
+
+    def draw(self, screen, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        x, y = self._draw_positions(alpha)
+        xs_all = x.astype(np.int32)
+        ys_all = y.astype(np.int32)
+        # Agrupamos por (tipo, color, tamaño): cada lote usa un único sprite pre-renderizado
+        groups = ((self.kind[:n].astype(np.int64) * 65536 + self.color[:n]) * 65536
+                  + self.w[:n].astype(np.int64) * 256 + self.h[:n].astype(np.int64))
+        for group in np.unique(groups):
+            rest, size = divmod(int(group), 65536)
+            kind, color_index = divmod(rest, 65536)
+            width, height = divmod(size, 256)
+            sprite, ox, oy = projectile_sprite(kind, self.palette[color_index], width, height)
+            mask = groups == group
+            xs = (xs_all[mask] + ox).tolist()
+            ys = (ys_all[mask] + oy).tolist()
+            screen.blits([(sprite, pos) for pos in zip(xs, ys)], doreturn=False)
+
+
+def projectile_sprite(kind, color, width, height):
+    """Sprite cacheado de un proyectil y su desplazamiento respecto a la esquina de la bala."""
+    if kind == KIND_LASER:
+        ox, oy = width // 2 - 1, 0
+    elif kind == KIND_PLAYER:
+        ox, oy = width // 2 - 6, height // 2 - 12
+    else:
+        ox, oy = 0, 0
+    key = ('projectile', kind, tuple(color), width, height)
+    sprite = sprite_cache.build(key, lambda: _convert(_render_projectile(kind, color, width, height)))
+    return sprite, ox, oy
+
+
+def _convert(surface):
+    # Las balas rectangulares son opacas: sin canal alfa el blit es más rápido
+    return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+
+
+def _render_projectile(kind, color, width, height):
+    if kind == KIND_LASER:
+        # Línea fina láser brillante
+        surface = pygame.Surface((3, height + 1), pygame.SRCALPHA)
+        glow_color = (min(255, color[0] + 80), min(255, color[1] + 80), min(255, color[2] + 80))
+        pygame.draw.line(surface, color, (1, 0), (1, height), 3)
+        pygame.draw.line(surface, glow_color, (1, 0), (1, height), 1)  # brillo suave
+    elif kind == KIND_ORB:
+        radius = width // 2
+        surface = pygame.Surface((width + 1, width + 1), pygame.SRCALPHA)
+        glow_color = (min(255, color[0] + 50), min(255, color[1] + 50), min(255, color[2] + 50))
+        pygame.draw.circle(surface, color, (radius, radius), radius)
+        pygame.draw.circle(surface, glow_color, (radius, radius), radius // 2)
+    elif kind == KIND_PLAYER:
+        # Halo elíptico de 12x24 con la bala en el centro
+        surface = pygame.Surface((max(12, width), max(24, height)), pygame.SRCALPHA)
+        pygame.draw.ellipse(surface, (180, 0, 180, 120), (0, 0, 12, 24))
+        surface.fill(color, (6 - width // 2, 12 - height // 2, width, height))
+    else:
+        surface = pygame.Surface((width, height))
+        surface.fill(color)
+    return surface
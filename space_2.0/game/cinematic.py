@@ -1,134 +1,101 @@
-import sys
-import pygame
-import os
-import time
-
-class Cinematics:
-    def __init__(self, screen_width, screen_height):
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.screen = pygame.display.get_surface()
-        self.images = []
-        self.current_image = None
-        self.alpha = 255  # Para efectos de desvanecimiento
-        self.fade_speed = 5  # Velocidad del desvanecimiento
-        
-        # Cargar imágenes de cinemáticas
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.intro_images = [
-            os.path.join(BASE_DIR, 'images', 'cinematic_1.png'),
-            os.path.join(BASE_DIR, 'images', 'cinematic_2.png')
-        ]
-        self.loser_image = os.path.join(BASE_DIR, 'images', 'cinematic_loser.png')
-        self.win_image = os.path.join(BASE_DIR, 'images', 'cinematic_win.png')
-        
-        # Precargar imágenes de introducción
-        self.loaded_intro_images = []
-        for path in self.intro_images:
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.scale(img, (self.screen_width, self.screen_height))
-                self.loaded_intro_images.append(img)
-            except Exception as e:
-                print(f"Error cargando imagen de cinemática: {path} - {e}")
-                placeholder = pygame.Surface((self.screen_width, self.screen_height))
-                placeholder.fill((0, 0, 0))
-                self.loaded_intro_images.append(placeholder)
-        
-        # Precargar imágenes de final
-        self.loaded_loser_image = self._load_final_image(self.loser_image, (255, 0, 0))  # Rojo para derrota
-        self.loaded_win_image = self._load_final_image(self.win_image, (0, 255, 0))     # Verde para victoria
-
-    def _load_final_image(self, path, fill_color):
-        """Carga una imagen de final con manejo de errores"""
-        try:
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (self.screen_width, self.screen_height))
-        except Exception as e:
-            print(f"Error cargando imagen de final {path}: {e}")
-            placeholder = pygame.Surface((self.screen_width, self.screen_height))
-            placeholder.fill(fill_color)
-            return placeholder
-
-    def show_intro(self):
-        """Muestra solo las 2 primeras imágenes antes del primer nivel"""
-        for img in self.loaded_intro_images[:2]:  # Solo las primeras dos imágenes
-            self.current_image = img
-            self.alpha = 0  # Comenzar transparente
-            
-            # Efecto de aparición (2 segundos)
-            for _ in range(0, 255, self.fade_speed):
-                if self._handle_events():  # Si devuelve True, el usuario quiere saltar
-                    return
-                self.current_image.set_alpha(self.alpha)
-                self.screen.fill((0, 0, 0))
-                self.screen.blit(self.current_image, (0, 0))
-                pygame.display.flip()
-                self.alpha += self.fade_speed
-                pygame.time.delay(30)
-            
-            # Mostrar imagen por 2 segundos
-            start_time = time.time()
-            while time.time() - start_time < 2:
-                if self._handle_events():  # Permitir saltar
-                    return
-                self.screen.blit(self.current_image, (0, 0))
-                pygame.display.flip()
-                pygame.time.delay(30)
-            
-            # Efecto de desvanecimiento (2 segundos)
-            for _ in range(255, 0, -self.fade_speed):
-                if self._handle_events():  # Permitir saltar
-                    return
-                self.current_image.set_alpha(self.alpha)
-                self.screen.fill((0, 0, 0))
-                self.screen.blit(self.current_image, (0, 0))
-                pygame.display.flip()
-                self.alpha -= self.fade_speed
-                pygame.time.delay(30)
-
-    def show_ending(self, victory=False):
-        """Muestra la cinemática final correspondiente"""
-        self.current_image = self.loaded_win_image if victory else self.loaded_loser_image
-        self.alpha = 0
-        
-        # Efecto de aparición (3 segundos)
-        for _ in range(0, 255, self.fade_speed):
-            if self._handle_events():  # Permitir saltar
-                return
-            self.current_image.set_alpha(self.alpha)
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(self.current_image, (0, 0))
-            pygame.display.flip()
-            self.alpha += self.fade_speed
-            pygame.time.delay(30)
-        
-        # Mostrar imagen por 3 segundos
-        start_time = time.time()
-        while time.time() - start_time < 3:
-            if self._handle_events():  # Permitir saltar
-                return
-            self.screen.blit(self.current_image, (0, 0))
-            pygame.display.flip()
-            pygame.time.delay(30)
-        
-        # Efecto de desvanecimiento (3 segundos)
-        for _ in range(255, 0, -self.fade_speed):
-            if self._handle_events():  # Permitir saltar
-                return
-            self.current_image.set_alpha(self.alpha)
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(self.current_image, (0, 0))
-            pygame.display.flip()
-            self.alpha -= self.fade_speed
-            pygame.time.delay(30)
-
-    def _handle_events(self):
-        """Maneja eventos durante las cinemáticas (solo ENTER puede saltar)"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                return True  # Permite saltar la cinemática solo con ENTER
-        return False
\ No newline at end of file
+import sys
+import pygame
+from .assets import sprite_cache
+
+
+class CinematicSequence:
+    """Secuencia de imágenes con aparición, pausa y desvanecimiento.
+
+    No tiene bucle propio: el bucle principal llama a `update(dt)` y `draw(screen)`
+    cada frame. Cada imagen se carga al empezar su paso, y el fundido depende del
+    tiempo transcurrido, no del número de frames dibujados.
+    """
+
+    def __init__(self, steps, size, fade_time=1.5, hold_time=2.0):
+        self.steps = steps  # [(archivo, color de reserva)]
+        self.size = size
+        self.fade_time = fade_time
+        self.hold_time = hold_time
+        self.step_time = 2 * fade_time + hold_time
+        self.elapsed = 0.0
+        self.finished = not steps
+        self.image = None
+        self.image_index = None
+        self.drawn = None  # (paso, alpha) presentado en pantalla
+        sprite_cache.prefetch(name for name, _ in steps)
+
+    def skip(self):
+        self.finished = True
+
+    def update(self, dt):
+        if self.finished:
+            return
+        self.elapsed += dt
+        if self.elapsed >= self.step_time * len(self.steps):
+            self.finished = True
+
+    def _alpha(self, t):
+        if t < self.fade_time:
+            return int(255 * t / self.fade_time)
+        if t < self.fade_time + self.hold_time:
+            return 255
+        return max(0, int(255 * (self.step_time - t) / self.fade_time))
+
+    def _load(self, index):
+        if index != self.image_index:
+            name, fallback_color = self.steps[index]
+            # La superficie de la caché es compartida: el fundido cambia su alpha, así que
+            # cada paso trabaja sobre una copia propia
+            self.image = sprite_cache.load(name, self.size, alpha=False, fallback_color=fallback_color).copy()
+            self.image_index = index
+        return self.image
+
+    def draw(self, screen):
+        """Dibuja el paso actual; devuelve False si la pantalla ya muestra ese mismo estado."""
+        if self.finished:
+            return False
+        index = min(int(self.elapsed // self.step_time), len(self.steps) - 1)
+        alpha = self._alpha(self.elapsed - index * self.step_time)
+        if (index, alpha) == self.drawn:
+            return False
+        self.drawn = (index, alpha)
+
+        image = self._load(index)
+        if alpha < 255:
+            screen.fill((0, 0, 0))
+            image.set_alpha(alpha)
+        else:
+            image.set_alpha(None)
+        screen.blit(image, (0, 0))
+        return True
+
+
+class Cinematics:
+    def __init__(self, screen_width, screen_height):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.intro_images = ['cinematic_1.png', 'cinematic_2.png']
+        self.loser_image = 'cinematic_loser.png'
+        self.win_image = 'cinematic_win.png'
+
+    def intro(self):
+        """Cinemática de introducción antes del primer nivel."""
+        steps = [(name, (0, 0, 0)) for name in self.intro_images]
+        return CinematicSequence(steps, (self.screen_width, self.screen_height),
+                                 fade_time=1.5, hold_time=2.0)
+
+    def ending(self, victory=False):
+        """Cinemática final correspondiente (rojo/verde si falta la imagen)."""
+        step = (self.win_image, (0, 255, 0)) if victory else (self.loser_image, (255, 0, 0))
+        return CinematicSequence([step], (self.screen_width, self.screen_height),
+                                 fade_time=1.5, hold_time=3.0)
+
+    @staticmethod
+    def handle_events(sequence):
+        """Eventos durante las cinemáticas (solo ENTER puede saltar)."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                sequence.skip()
@@ -0,0 +1,183 @@
+import pygame
+import numpy as np
+from .bullets import PLAYER_OWNER
+
+
+class CollisionResult:
+    """Resultado en bloque de un paso de colisiones."""
+
+    def __init__(self, bullet_count):
+        self.consumed = np.zeros(bullet_count, dtype=bool)  # balas que impactaron
+        self.hits = []               # enemigos dañados sin morir (uno por impacto)
+        self.kills = []              # enemigos destruidos
+        self.shield_hits = []        # escudos dañados (uno por impacto)
+        self.shields_destroyed = []
+        self.player_hits = 0
+
+
+class SpatialGrid:
+    """Broad-phase de rejilla uniforme para enemigos, escudos y jugador.
+
+    Escudos y jugador se vuelven a insertar en cada tick (son pocos); la capa de
+    enemigos, que pueden ser miles, solo cuando cambia su lista o la formación se
+    mueve (`invalidate_enemies`). Los enemigos eliminados entre medias siguen en sus
+    celdas pero se descartan por `dead`. Cada bala solo se prueba contra los
+    objetivos de las celdas que toca.
+    """
+
+    ENEMY = 0
+    SHIELD = 1
+    PLAYER = 2
+
+    def __init__(self, width, height, cell_size=64):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = (width + cell_size - 1) // cell_size
+        self.rows = (height + cell_size - 1) // cell_size
+        self.cells = ({}, {}, {})  # por grupo: (fila, columna) -> lista de (orden, objetivo)
+        self.occupied = np.zeros((3, self.rows, self.cols), dtype=bool)
+        self.enemy_list = None  # lista con la que se construyó la capa de enemigos
+
+    def clear(self, groups=(ENEMY, SHIELD, PLAYER)):
+        for group in groups:
+            self.cells[group].clear()
+            self.occupied[group] = False
+        if self.ENEMY in groups:
+            self.enemy_list = None
+
+    def invalidate_enemies(self):
+        """Los enemigos se han movido: su capa se reconstruye en el próximo `rebuild`."""
+        self.enemy_list = None
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        c0 = max(0, min(self.cols - 1, rect.left // cs))
+        c1 = max(0, min(self.cols - 1, (rect.right - 1) // cs))
+        r0 = max(0, min(self.rows - 1, rect.top // cs))
+        r1 = max(0, min(self.rows - 1, (rect.bottom - 1) // cs))
+        return r0, r1, c0, c1
+
+    def insert(self, group, order, target):
+        r0, r1, c0, c1 = self._cell_range(target.rect)
+        cells = self.cells[group]
+        for row in range(r0, r1 + 1):
+            for col in range(c0, c1 + 1):
+                cells.setdefault((row, col), []).append((order, target))
+        self.occupied[group, r0:r1 + 1, c0:c1 + 1] = True
+
+    def insert_many(self, group, targets):
+        """Inserta `targets` (con orden = su índice) calculando sus celdas en bloque con numpy."""
+        if not targets:
+            return
+        cs = self.cell_size
+        rects = np.fromiter((v for target in targets for v in target.rect), dtype=np.int64,
+                            count=4 * len(targets))
+        left, top, width, height = rects.reshape(-1, 4).T
+        c0 = np.clip(left // cs, 0, self.cols - 1)
+        c1 = np.clip((left + width - 1) // cs, 0, self.cols - 1)
+        r0 = np.clip(top // cs, 0, self.rows - 1)
+        r1 = np.clip((top + height - 1) // cs, 0, self.rows - 1)
+
+        # Un par (celda, orden) por cada celda que toca cada objetivo
+        orders = np.arange(len(targets))
+        cell_ids, cell_orders = [], []
+        for dr in range(int((r1 - r0).max()) + 1):
+            for dc in range(int((c1 - c0).max()) + 1):
+                inside = (r0 + dr <= r1) & (c0 + dc <= c1)
+                cell_ids.append(((r0 + dr) * self.cols + c0 + dc)[inside])
+                cell_orders.append(orders[inside])
+        cell_ids = np.concatenate(cell_ids)
+        cell_orders = np.concatenate(cell_orders)
+        sort = np.lexsort((cell_orders, cell_ids))
+        cell_ids = cell_ids[sort]
+        cell_orders = cell_orders[sort].tolist()
+        unique_ids, starts = np.unique(cell_ids, return_index=True)
+
+        cells = self.cells[group]
+        ends = starts.tolist()[1:] + [len(cell_orders)]
+        for cell_id, start, end in zip(unique_ids.tolist(), starts.tolist(), ends):
+            cells[divmod(cell_id, self.cols)] = [(order, targets[order]) for order in cell_orders[start:end]]
+        self.occupied[group].flat[unique_ids] = True
+
+    def rebuild(self, enemies, shields, player):
+        if enemies is not self.enemy_list:
+            self.clear((self.ENEMY,))
+            self.insert_many(self.ENEMY, enemies)
+            self.enemy_list = enemies
+        self.clear((self.SHIELD, self.PLAYER))
+        for order, shield in enumerate(shields):
+            self.insert(self.SHIELD, order, shield)
+        self.insert(self.PLAYER, 0, player)
+
+    def _bullet_cells(self, bullets):
+        """Celdas de las cuatro esquinas de cada bala (las balas son menores que una celda)."""
+        n = bullets.count
+        cs = self.cell_size
+        x, y = bullets.x[:n], bullets.y[:n]
+        c0 = np.clip((x // cs).astype(np.int32), 0, self.cols - 1)
+        c1 = np.clip(((x + bullets.w[:n] - 1) // cs).astype(np.int32), 0, self.cols - 1)
+        r0 = np.clip((y // cs).astype(np.int32), 0, self.rows - 1)
+        r1 = np.clip(((y + bullets.h[:n] - 1) // cs).astype(np.int32), 0, self.rows - 1)
+        return r0, r1, c0, c1
+
+    def _touches(self, group, r0, r1, c0, c1):
+        occ = self.occupied[group]
+        return occ[r0, c0] | occ[r0, c1] | occ[r1, c0] | occ[r1, c1]
+
+    def _targets(self, group, r0, r1, c0, c1):
+        found = {}
+        cells = self.cells[group]
+        for row in {r0, r1}:
+            for col in {c0, c1}:
+                for order, target in cells.get((row, col), ()):
+                    found[order] = target
+        return [found[order] for order in sorted(found)]
+
+    def resolve(self, bullets, enemies, shields, player):
+        """Calcula todos los impactos del tick y los devuelve como un CollisionResult."""
+        self.rebuild(enemies, shields, player)
+        result = CollisionResult(bullets.count)
+        if bullets.count == 0:
+            return result
+
+        r0, r1, c0, c1 = self._bullet_cells(bullets)
+        from_player = bullets.owner[:bullets.count] == PLAYER_OWNER
+        candidates = np.flatnonzero(
+            (from_player & self._touches(self.ENEMY, r0, r1, c0, c1))
+            | (~from_player & (self._touches(self.SHIELD, r0, r1, c0, c1)
+                               | self._touches(self.PLAYER, r0, r1, c0, c1)))
+        )
+
+        for i in candidates.tolist():
+            bullet_rect = pygame.Rect(int(bullets.x[i]), int(bullets.y[i]), int(bullets.w[i]), int(bullets.h[i]))
+            cells = (int(r0[i]), int(r1[i]), int(c0[i]), int(c1[i]))
+
+            if from_player[i]:
+                for enemy in self._targets(self.ENEMY, *cells):
+                    if not enemy.dead and bullet_rect.colliderect(enemy.rect):
+                        result.consumed[i] = True
+                        enemy.receive_damage()
+                        if enemy.dead:
+                            result.kills.append(enemy)
+                        else:
+                            result.hits.append(enemy)
+                        break
+                continue
+
+            for shield in self._targets(self.SHIELD, *cells):
+                if not shield.is_destroyed() and bullet_rect.colliderect(shield.rect):
+                    result.consumed[i] = True
+                    shield.take_damage()
+                    result.shield_hits.append(shield)
+                    if shield.is_destroyed():
+                        result.shields_destroyed.append(shield)
+                    break
+            if result.consumed[i]:
+                continue
+
+            if bullet_rect.colliderect(player.rect):
+                result.consumed[i] = True
+                result.player_hits += 1
+
+        return result
@@ -1,59 +1,39 @@
+import itertools
+import numpy as np
 import pygame
-import random
-import math
-import os
-
-class EnemyBullet:
-    def __init__(self, x, y, speed=3, color=(255, 0, 0), width=4, height=16, shape="rect"):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.speed = speed
-        self.color = color
-        self.shape = shape 
-        
+from .assets import sprite_cache
+from .bullets import KIND_RECT, KIND_LASER, KIND_ORB
+from .timestep import interpolate
+
+# Identificadores únicos de enemigo, usados como dueño de sus balas en el BulletPool
+_enemy_ids = itertools.count(1)
 
-    def update(self, screen_height):
-        self.rect.y += self.speed
-        return self.rect.top <= screen_height
-
-    def draw(self, screen):
-        if self.shape == "laser":
-            # Línea fina láser brillante
-            start_pos = (self.rect.centerx, self.rect.top)
-            end_pos = (self.rect.centerx, self.rect.bottom)
-            pygame.draw.line(screen, self.color, start_pos, end_pos, 3)
-            glow_color = (min(255, self.color[0]+80), min(255, self.color[1]+80), min(255, self.color[2]+80))
-            pygame.draw.line(screen, glow_color, start_pos, end_pos, 1)  # brillo suave
-        else:
-            # Bala rectangular normal
-            pygame.draw.rect(screen, self.color, self.rect)
+# Direcciones de la ráfaga radial: 8 balas separadas 45 grados
+_RADIAL_ANGLES = np.radians(np.arange(0, 360, 45))
+_RADIAL_DX = np.cos(_RADIAL_ANGLES)
+_RADIAL_DY = np.sin(_RADIAL_ANGLES)
 
 class Enemy:
-    def __init__(self, x, y, bullet_speed=3, lives=1, image_name='cat.png'):
-        try:
-            base_path = os.path.dirname(__file__)
-            image_path = os.path.join(base_path, '..', 'images', image_name)
-            image_path = os.path.abspath(image_path)
-
-            print(f"Intentando cargar imagen del enemigo desde: {image_path}")
-            self.image_original = pygame.image.load(image_path).convert_alpha()
-            self.image_original = pygame.transform.scale(self.image_original, (90, 80))
-        except Exception as e:
-            print(f"Error cargando imagen del enemigo: {e}")
-            self.image_original = pygame.Surface((90, 80))
-            self.image_original.fill((255, 0, 0))
-
-        self.image = self.image_original.copy()
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
+    IMAGE_SIZE = (90, 80)
+    MAX_FIRE_RATE = 2.0  # tope de disparos por segundo de cada enemigo del tipo
+
+    def __init__(self, x, y, bullet_speed=3, lives=1, image_name='cat.png', image_size=IMAGE_SIZE):
+        # La superficie, compartida por todos los enemigos del mismo tipo, se pide a la
+        # caché al dibujar por primera vez: crear el nivel no espera a que termine de
+        # leerse en segundo plano (p. ej. durante la introducción)
+        self.image_name = image_name
+        self.image_size = image_size
+        self.image = None
+        self.rect = pygame.Rect(x, y, *image_size)
         self.speed = 4
         self.direction = 1
         self.move_down_distance = 20
-        self.bullets = []
+        self.uid = next(_enemy_ids)
         self.bullet_speed = bullet_speed
         self.lives = lives
+        self.max_lives = lives  # vidas iniciales, para la barra de vida
         self.dead = False
-        self.shoot_probability = 0.0
+        self.fire_rate = 0.0  # disparos por segundo (ver FireScheduler)
         self.bullet_color = (255, 0, 0)  # Default red bullet
         
 
@@ -69,27 +49,27 @@ class Enemy:
         if not self.dead:
             self.rect.y += self.move_down_distance
 
-    def try_shoot(self):
-        if not self.dead and random.random() < self.shoot_probability:
-            bullet = EnemyBullet(
-                self.rect.centerx - 2,
-                self.rect.bottom,
-                speed=self.bullet_speed,
-                color=self.bullet_color,
-                shape=getattr(self, 'bullet_shape', 'rect')  # por defecto rect si no está definido
-            )
-            self.bullets.append(bullet)
-
-    def update_bullets(self, screen_height):
-        for bullet in self.bullets[:]:
-            if not bullet.update(screen_height):
-                self.bullets.remove(bullet)
-
-    def draw(self, screen):
+    @classmethod
+    def fire_volley(cls, bullets, shooters):
+        """Dispara a la vez una bala recta por cada enemigo de `shooters` (todos de esta clase)."""
+        first = shooters[0]
+        shape = getattr(first, 'bullet_shape', 'rect')  # por defecto rect si no está definido
+        bullets.spawn_many(
+            np.array([enemy.rect.centerx - 2 for enemy in shooters]),
+            np.array([enemy.rect.bottom for enemy in shooters]),
+            0,
+            np.array([enemy.bullet_speed for enemy in shooters]),
+            4, 16,
+            KIND_LASER if shape == "laser" else KIND_RECT,
+            first.bullet_color,
+            np.array([enemy.uid for enemy in shooters])
+        )
+
+    def draw(self, screen, alpha=1.0):
         if not self.dead:
-            screen.blit(self.image, self.rect)
-        for bullet in self.bullets:
-            bullet.draw(screen)
+            if self.image is None:
+                self.image = sprite_cache.load(self.image_name, self.image_size)
+            return screen.blit(self.image, interpolate(self, alpha))
 
     def receive_damage(self):
         if self.dead:
@@ -97,96 +77,73 @@ class Enemy:
         self.lives -= 1
         if self.lives <= 0:
             self.dead = True
-            self.bullets.clear()
 
 class BasicEnemy(Enemy):
-    def __init__(self, x, y, bullet_speed=3, level=1):
-        super().__init__(x, y, bullet_speed=bullet_speed, lives=1, image_name='cat.png')
-        self.shoot_probability = 0.06 * (3 ** (level - 1))
+    IMAGE = 'cat.png'
+
+    def __init__(self, x, y, bullet_speed=3, level=1, image_size=None):
+        super().__init__(x, y, bullet_speed=bullet_speed, lives=1, image_name=self.IMAGE,
+                         image_size=image_size or self.IMAGE_SIZE)
+        self.fire_rate = 0.24 * (3 ** (level - 1))
         self.bullet_color = (255, 0, 0)
         self.bullet_shape = "rect"
 
 
 class StrongEnemy(Enemy):
-    def __init__(self, x, y, bullet_speed=3, level=1):
-        super().__init__(x, y, bullet_speed=bullet_speed, lives=2, image_name='ship.png')
-        self.shoot_probability = 0.12 * (3 ** (level - 1))
+    IMAGE = 'ship.png'
+
+    def __init__(self, x, y, bullet_speed=3, level=1, image_size=None):
+        super().__init__(x, y, bullet_speed=bullet_speed, lives=2, image_name=self.IMAGE,
+                         image_size=image_size or self.IMAGE_SIZE)
+        self.fire_rate = 0.48 * (3 ** (level - 1))
         self.bullet_color = (255, 0, 255)  # magenta
         self.bullet_shape = "laser"
 
 class FinalBoss(Enemy):
-    def __init__(self, x, y, bullet_speed=4):
-        super().__init__(x, y, bullet_speed=bullet_speed, lives=10, image_name='final_boss.png')
-        try:
-            base_path = os.path.dirname(__file__)
-            image_path = os.path.join(base_path, '..', 'images', 'final_boss.png')
-            image_path = os.path.abspath(image_path)
-            self.image_original = pygame.image.load(image_path).convert_alpha()
-            self.image_original = pygame.transform.scale(self.image_original, (180, 160))  # nave más grande
-        except Exception as e:
-            print(f"Error cargando imagen del jefe final: {e}")
-            self.image_original = pygame.Surface((180, 160))
-            self.image_original.fill((255, 0, 0))
-
-        self.image = self.image_original.copy()
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
+    IMAGE = 'final_boss.png'
+    IMAGE_SIZE = (180, 160)  # nave más grande
+
+    def __init__(self, x, y, bullet_speed=4, image_size=None):
+        super().__init__(x, y, bullet_speed=bullet_speed, lives=10, image_name=self.IMAGE,
+                         image_size=image_size or self.IMAGE_SIZE)
         self.speed = 20
         self.direction = 1
         self.move_down_distance = 10
-        self.shoot_probability = 0.5
+        self.fire_rate = 2.0
         self.bullet_color = (255, 0, 255)
         self.bullet_shape = "laser"
-        self.lives = 20  # más vida
+        self.lives = self.max_lives = 20  # más vida
         self.dead = False
 
 class RadialEnemy(Enemy):
-    def __init__(self, x, y, bullet_speed=3, level=1):
-        super().__init__(x, y, bullet_speed=bullet_speed, lives=3, image_name='radial_enemy.png')
-        self.shoot_probability = 0.15 * (3 ** (level - 1))
+    IMAGE = 'radial_enemy.png'
+    MAX_FIRE_RATE = 1.0  # cada disparo son 8 balas
+
+    def __init__(self, x, y, bullet_speed=3, level=1, image_size=None):
+        super().__init__(x, y, bullet_speed=bullet_speed, lives=3, image_name=self.IMAGE,
+                         image_size=image_size or self.IMAGE_SIZE)
+        self.fire_rate = 0.6 * (3 ** (level - 1))
         self.bullet_color = (255, 165, 0)  # Color naranja
         self.bullet_radius = 6  # Balas redondas más grandes
+        self.bullet_max_age = 10.0  # segundos; red de seguridad además del recorte por bordes
         
-    def try_shoot(self):
-        if not self.dead and random.random() < self.shoot_probability:
-            # Dispara 8 balas en todas direcciones (45 grados cada una)
-            for angle in range(0, 360, 45):
-                rad = math.radians(angle)
-                bullet = RadialBullet(
-                    self.rect.centerx,
-                    self.rect.centery,
-                    self.bullet_speed,
-                    math.cos(rad),  # Dirección X
-                    math.sin(rad),  # Dirección Y
-                    self.bullet_radius,
-                    self.bullet_color
-                )
-                self.bullets.append(bullet)
-
-class RadialBullet:
-    def __init__(self, x, y, speed, dx, dy, radius, color):
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.dx = dx
-        self.dy = dy
-        self.radius = radius
-        self.color = color
-        # Añadimos un rectángulo para las colisiones
-        self.rect = pygame.Rect(x - radius, y - radius, radius * 2, radius * 2)
-        
-    def update(self, screen_height):
-        self.x += self.dx * self.speed
-        self.y += self.dy * self.speed
-        # Actualizamos la posición del rectángulo
-        self.rect.x = self.x - self.radius
-        self.rect.y = self.y - self.radius
-        return self.y <= screen_height
-        
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.radius)
-        glow_color = (min(255, self.color[0]+50), min(255, self.color[1]+50), min(255, self.color[2]+50))
-        pygame.draw.circle(screen, glow_color, (int(self.x), int(self.y)), int(self.radius/2))
-
-        
\ No newline at end of file
+    @classmethod
+    def fire_volley(cls, bullets, shooters):
+        """Ráfaga de 8 balas en todas direcciones (45 grados cada una) por cada enemigo."""
+        first = shooters[0]
+        r = first.bullet_radius
+        n = len(_RADIAL_DX)
+        cx = np.array([enemy.rect.centerx - r for enemy in shooters])
+        cy = np.array([enemy.rect.centery - r for enemy in shooters])
+        speed = np.array([enemy.bullet_speed for enemy in shooters], dtype=np.float64)
+        bullets.spawn_many(
+            np.repeat(cx, n),
+            np.repeat(cy, n),
+            np.outer(speed, _RADIAL_DX).ravel(),
+            np.outer(speed, _RADIAL_DY).ravel(),
+            r * 2, r * 2,
+            KIND_ORB,
+            first.bullet_color,
+            np.repeat([enemy.uid for enemy in shooters], n),
+            max_age=first.bullet_max_age
+        )
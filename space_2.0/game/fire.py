@@ -0,0 +1,51 @@
+import numpy as np
+from .timestep import FIXED_DT
+
+
+class FireScheduler:
+    """Decide en bloque qué enemigos disparan en cada tick.
+
+    Cada enemigo tiene una cadencia `fire_rate` en disparos por segundo, limitada por
+    el `MAX_FIRE_RATE` de su clase. Los disparos siguen un proceso de Poisson: en cada
+    tick se sortea a la vez para todos con probabilidad 1 - exp(-cadencia * dt), y las
+    balas de los que disparan se emiten juntas por tipo con `fire_volley`.
+    """
+
+    def __init__(self, enemies, seed, dt=FIXED_DT):
+        self.rng = np.random.default_rng(seed)
+        self.enemies = list(enemies)
+        self.index = {enemy.uid: i for i, enemy in enumerate(self.enemies)}
+        self.types = []
+        type_ids = {}
+        type_of = []
+        rates = []
+        for enemy in self.enemies:
+            cls = type(enemy)
+            if cls not in type_ids:
+                type_ids[cls] = len(self.types)
+                self.types.append(cls)
+            type_of.append(type_ids[cls])
+            rates.append(min(enemy.fire_rate, cls.MAX_FIRE_RATE))
+        self.type_of = np.array(type_of, dtype=np.int64)
+        self.rates = np.array(rates, dtype=np.float64)
+        self.alive = np.ones(len(self.enemies), dtype=bool)
+        self.fire_probability = -np.expm1(-self.rates * dt)
+
+    def remove(self, enemy):
+        i = self.index.pop(enemy.uid, None)
+        if i is not None:
+            self.alive[i] = False
+
+    def update(self, bullets):
+        """Sortea los disparos de este tick y emite sus balas; devuelve cuántos enemigos dispararon."""
+        n = len(self.enemies)
+        if n == 0:
+            return 0
+        fired = self.alive & (self.rng.random(n) < self.fire_probability)
+        shooters = np.flatnonzero(fired)
+        if shooters.size == 0:
+            return 0
+        for type_id in np.unique(self.type_of[shooters]):
+            selected = shooters[self.type_of[shooters] == type_id]
+            self.types[type_id].fire_volley(bullets, [self.enemies[i] for i in selected])
+        return int(shooters.size)
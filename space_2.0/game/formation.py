@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class _Group:
+    """Miembros de la formación que comparten velocidad y distancia de bajada."""
+
+    def __init__(self, speed, move_down_distance):
+        self.speed = speed
+        self.move_down_distance = move_down_distance
+        self.enemies = []
+        self.offset_x = 0
+        self.offset_y = 0
+
+    def freeze(self):
+        """Pasa las posiciones de los miembros a arrays relativos al desplazamiento del grupo."""
+        rects = [enemy.rect for enemy in self.enemies]
+        self.x = np.array([rect.x for rect in rects], dtype=np.int64)
+        self.y = np.array([rect.y for rect in rects], dtype=np.int64)
+        self.right = self.x + np.array([rect.width for rect in rects], dtype=np.int64)
+        self.bottom = self.y + np.array([rect.height for rect in rects], dtype=np.int64)
+        self.alive = np.ones(len(rects), dtype=bool)
+        self.update_bounds()
+
+    def update_bounds(self):
+        """Caja envolvente (relativa) de los miembros vivos."""
+        self.count = int(self.alive.sum())
+        if self.count:
+            self.min_left = int(self.x[self.alive].min())
+            self.max_right = int(self.right[self.alive].max())
+            self.max_bottom = int(self.bottom[self.alive].max())
+
+
+class Formation:
+    """Enjambre de enemigos que se mueve como un bloque.
+
+    Cada grupo de velocidad guarda un único desplazamiento y la posición de sus
+    miembros relativa a él, junto con la caja envolvente de los vivos. Avanzar,
+    detectar el borde y bajar cuesta O(grupos); las rects de los enemigos solo se
+    recalculan (`materialize`) tras cada paso, para el dibujo y las colisiones.
+    """
+
+    def __init__(self, enemies, screen_width):
+        self.screen_width = screen_width
+        self.direction = 1
+        groups = {}
+        self.members = {}  # uid -> (grupo, índice)
+        for enemy in enemies:
+            key = (enemy.speed, enemy.move_down_distance)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = _Group(*key)
+            self.members[enemy.uid] = (group, len(group.enemies))
+            group.enemies.append(enemy)
+        self.groups = list(groups.values())
+        for group in self.groups:
+            group.freeze()
+
+    def step(self):
+        """Avanza un paso horizontal; devuelve True si algún miembro toca un borde."""
+        hit_edge = False
+        for group in self.groups:
+            if not group.count:
+                continue
+            group.offset_x += group.speed * self.direction
+            if (group.max_right + group.offset_x >= self.screen_width
+                    or group.min_left + group.offset_x <= 0):
+                hit_edge = True
+        self.materialize()
+        return hit_edge
+
+    def bounce(self):
+        """Invierte la dirección y baja cada grupo su distancia."""
+        self.direction *= -1
+        for group in self.groups:
+            group.offset_y += group.move_down_distance
+        self.materialize()
+
+    def remove(self, enemy):
+        member = self.members.pop(enemy.uid, None)
+        if member is None:
+            return
+        group, index = member
+        group.alive[index] = False
+        group.update_bounds()
+
+    @property
+    def bottom(self):
+        """Borde inferior de la formación, o None si no quedan miembros."""
+        bottoms = [group.max_bottom + group.offset_y for group in self.groups if group.count]
+        return max(bottoms) if bottoms else None
+
+    def materialize(self):
+        """Coloca las rects de los miembros vivos según el desplazamiento de su grupo."""
+        for group in self.groups:
+            if not group.count:
+                continue
+            xs = (group.x + group.offset_x).tolist()
+            ys = (group.y + group.offset_y).tolist()
+            for enemy, x, y, alive in zip(group.enemies, xs, ys, group.alive.tolist()):
+                if alive:
+                    enemy.rect.topleft = (x, y)
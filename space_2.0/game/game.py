@@ -2,59 +2,129 @@ import pygame
 import sys
 import os
 import random
+import hashlib
 from .player import Player
 from .enemy import BasicEnemy, StrongEnemy, FinalBoss
 from .cloud import Cloud 
 from .satellite import Satellite
 from .shield import Shield
 from .cinematic import Cinematics
+from .prefetch import LevelPrefetcher
+from .audio import AudioService
 from .levels import LevelManager
+from .waves import WaveGenerator, WaveStats
+from .input import InputState, KeyboardInput, ScriptedInput
+from .profiler import FrameProfiler
+from .bullets import BulletPool, BoundsPolicy, MaxAgePolicy
+from .collision import SpatialGrid
+from .formation import Formation
+from .fire import FireScheduler
+from .render import DirtyRectRenderer
+from .hud import HUD, LevelBanner, text_cache
+from .timestep import FixedTimestep, FIXED_DT, EPSILON, interpolate
+
+def _ignore_rect(rect):
+    pass
+
+def display_refresh_rate(default=60):
+    """Frecuencia de refresco del monitor, para no limitar el dibujo a 60 FPS en pantallas rápidas."""
+    try:
+        rates = [rate for rate in pygame.display.get_desktop_refresh_rates() if rate > 0]
+    except (AttributeError, pygame.error):
+        return default
+    return max(rates) if rates else default
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, headless=False, input_source=None, seed=None, start_level=1, dirty_rects=False,
+                 scenes=None, endless=False):
+        # En modo headless no hay ventana ni audio reales, ni presentación bloqueante
+        self.headless = headless
+        # Modo infinito: oleadas generadas sin fin en lugar de los niveles de levels/
+        self.endless = endless
+        # Gestor de escenas que nos ha lanzado; sin él la partida se ejecuta por su cuenta
+        self.scenes = scenes
+        self.running = True
         self.screen_width = 800
         self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        if scenes:
+            self.screen = scenes.screen
+        else:
+            if headless:
+                os.environ['SDL_VIDEODRIVER'] = 'dummy'
+                os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Invasión Espacial")
-
-        self.clock = pygame.time.Clock()
-        self.fps = 60
+        # Modo opcional de rectángulos sucios: solo se repinta y presenta lo que cambió
+        self.renderer = DirtyRectRenderer(self.screen) if dirty_rects else None
+
+        self.clock = scenes.clock if scenes else pygame.time.Clock()
+        # Efectos y volúmenes compartidos con el menú cuando hay gestor de escenas
+        self.audio = scenes.audio if scenes else AudioService(enabled=not headless)
+        # La simulación avanza a paso fijo (FIXED_DT); fps solo limita el dibujo
+        self.fps = 0 if headless else display_refresh_rate()  # 0 = sin límite
+        self.timestep = FixedTimestep()
+        self.input = input_source or (ScriptedInput(()) if headless else KeyboardInput())
+        self.profiler = FrameProfiler()
         self.font = pygame.font.SysFont(None, 36)
         self.title_font = pygame.font.SysFont(None, 64)
         self.small_font = pygame.font.SysFont(None, 28)
+        self.hud = HUD(self.screen_width, self.font)
+        self.level_banner = LevelBanner(self.screen_width, self.screen_height,
+                                        label="Oleada" if endless else "Nivel")
         
-        self.level_manager = LevelManager(self.screen_width, self.screen_height)
-        self.current_level = 1
-        self.max_levels = 3
+        # Generador aleatorio propio: con la misma semilla y la misma entrada la partida se repite igual
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+
+        waves = WaveGenerator(self.seed, self.screen_width, self.screen_height) if endless else None
+        self.level_manager = LevelManager(self.screen_width, self.screen_height, self.rng, waves=waves)
+        self.current_level = start_level
+        self.max_levels = self.level_manager.level_count  # None en modo infinito
+        # FPS sostenidos por oleada, para ver dónde deja de aguantar 60 FPS
+        self.wave_stats = WaveStats() if endless else None
         self.level_background = None
-        self.load_level_background()
+
+        # La introducción la reproduce el bucle principal; mientras tanto se leen del
+        # disco las imágenes del nivel y el fondo se convierte cuando termina
+        self.cinematics = Cinematics(self.screen_width, self.screen_height)
+        self.cinematic = None
+        if headless:
+            self.load_level_background()
+        else:
+            self.cinematic = self.cinematics.intro()
+        # Recursos del nivel actual (y del siguiente) preparados en segundo plano
+        self.prefetcher = LevelPrefetcher(self.level_manager, self.audio.music)
+        self.prefetch_levels()
 
         self.player = Player(self.screen_width // 2, self.screen_height - 70)
+        self.bullets = BulletPool(policies=[
+            BoundsPolicy(self.screen_width, self.screen_height),
+            MaxAgePolicy(),
+        ])
+        self.collision_grid = SpatialGrid(self.screen_width, self.screen_height)
         self.enemies = []
         self.create_enemies()
-
-        self.volume_general = 0.5
-        self.volume_musica = 0.5
-        self.volume_efectos = 0.5
-        self.muted = False
+        self.level_banner.show(self.current_level)
 
         self.score = 0
         self.game_over = False
         self.victory = False
         self.enemy_direction = 1
-        self.enemy_move_timer = 0
-        self.enemy_move_interval = 15
+        # Temporizadores en segundos de simulación
+        self.enemy_move_timer = 0.0
+        self.enemy_move_interval = 0.25
 
         self.clouds = []
-        self.cloud_spawn_timer = 0
-        self.cloud_spawn_interval = 60
+        self.cloud_spawn_timer = 0.0
+        self.cloud_spawn_interval = 1.0
 
         self.satellites = []
-        self.satellite_spawn_timer = 0
-        self.satellite_spawn_interval_min = 240
-        self.satellite_spawn_interval_max = 480
-        self.next_satellite_spawn_interval = random.randint(
+        self.satellite_spawn_timer = 0.0
+        self.satellite_spawn_interval_min = 4.0
+        self.satellite_spawn_interval_max = 8.0
+        self.next_satellite_spawn_interval = self.rng.uniform(
             self.satellite_spawn_interval_min, 
             self.satellite_spawn_interval_max
         )
@@ -66,69 +136,45 @@ class Game:
         self.game_over_buttons = []
         self.victory_buttons = []
         self.hovered_pause_buttons = set()
-
-        self.cinematics = Cinematics(self.screen_width, self.screen_height)
-        self.show_intro_cinematic = True
+        self.pause_frame = None      # último frame de juego ya oscurecido, capturado al pausar
+        self.pause_signature = None  # estado del menú de pausa mostrado en pantalla
+        self.button_cache = {}       # (texto, tamaño, hover) -> botón ya renderizado
+        self.sound_panel = None
 
         base_path = os.path.dirname(__file__)
         self.save_path = os.path.join(base_path, '..', 'savegame.txt')
-        self.init_sounds()
-
-    def init_sounds(self):
-        try:
-            pygame.mixer.init()
-            base_path = os.path.dirname(__file__)
-            
-            self.click_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'eleccion_menu.mp3'))
-            self.hover_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'seleccionar_menu.mp3'))
-            self.damage_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'daño_recibido_prota.mp3'))
-            self.shoot_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'disparo_protagonista.mp3'))
-            self.destroyed_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'estructura_destruida.mp3'))
-            self.death_sound = pygame.mixer.Sound(os.path.join(base_path, '..', 'sounds', 'sonido_muerte_prota.mp3'))
-            
-            for sound in [self.click_sound, self.hover_sound, self.damage_sound, 
-                         self.shoot_sound, self.destroyed_sound, self.death_sound]:
-                sound.set_volume(0.5)
-                
-        except Exception as e:
-            print(f"Error cargando sonidos: {e}")
-
         self.play_level_music()
 
-    def show_level_intro(self):
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  
-        
-        font = pygame.font.SysFont(None, 72)
-        level_text = font.render(f"Nivel {self.current_level}", True, (255, 255, 255))
-        text_rect = level_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
-        
-        self.screen.blit(overlay, (0, 0))
-        self.screen.blit(level_text, text_rect)
-        pygame.display.flip()
-        pygame.time.delay(1500)  # 1.5 segundos
-
     def play_level_music(self):
-        base_path = os.path.dirname(__file__)
-        sounds_path = os.path.join(base_path, '..', 'sounds')
-        pygame.mixer.music.stop()
-        
         music_file = self.level_manager.get_level_music(self.current_level)
         if music_file:
-            try:
-                pygame.mixer.music.load(os.path.join(sounds_path, music_file))
-                pygame.mixer.music.play(-1)
-                pygame.mixer.music.set_volume(self.volume_musica * self.volume_general)
-            except Exception as e:
-                print(f"Error cargando música: {e}")
+            self.audio.music.play(music_file)
+        else:
+            self.audio.music.stop()
+
+    def prefetch_levels(self):
+        """Pide en segundo plano los recursos del nivel actual y del siguiente."""
+        if self.headless:
+            return
+        self.prefetcher.prefetch(self.current_level)
+        self.prefetcher.prefetch(self.current_level + 1)
+        self.prefetcher.retain_music((self.current_level, self.current_level + 1))
 
     def load_level_background(self):
         self.level_background = self.level_manager.load_level_background(self.current_level)
 
     def create_enemies(self):
-        self.enemies = self.level_manager.create_enemies(self.current_level)
+        self.set_enemies(self.level_manager.create_enemies(self.current_level))
         self.shields = self.level_manager.create_shields(self.current_level)
 
+    def set_enemies(self, enemies):
+        """Reemplaza los enemigos del nivel y los agrupa en una formación."""
+        self.enemies = enemies
+        self.wave_size = len(enemies)
+        self.formation = Formation(enemies, self.screen_width)
+        # Semilla sacada del generador de la partida para que las repeticiones coincidan
+        self.fire_scheduler = FireScheduler(enemies, self.rng.getrandbits(64))
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -137,24 +183,16 @@ class Game:
                 sys.exit()
     
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and not self.game_over and not self.paused and not self.victory:
-                    self.player.shoot()
-                    if self.shoot_sound:
-                        self.shoot_sound.play()
-                if event.key == pygame.K_ESCAPE and not self.game_over and not self.victory:
-                    if self.paused and self.pause_menu_state in ["options", "sound", "controls"]:
-                        self.pause_menu_state = "main"
-                    else:
-                        self.paused = not self.paused
-                        self.pause_menu_state = "main"
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                self.input.press(event.key)
     
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 mouse_pos = pygame.mouse.get_pos()
                 if self.paused and not self.game_over and not self.victory:
                     for i, btn_rect in enumerate(self.pause_buttons):
                         if btn_rect.collidepoint(mouse_pos):
-                            if self.click_sound:
-                                self.click_sound.play()
+                            self.audio.play('click')
                             self.handle_pause_menu_click(i)
 
     def handle_pause_menu_click(self, button_index):
@@ -184,71 +222,90 @@ class Game:
                 self.back_to_pause_main()
 
     def toggle_mute(self):
-        self.muted = not self.muted
-        if self.muted:
-            pygame.mixer.music.set_volume(0)
-            for s in [self.shoot_sound, self.damage_sound, self.death_sound, 
-                     self.click_sound, self.hover_sound, self.destroyed_sound]:
-                if s: s.set_volume(0)
-        else:
-            pygame.mixer.music.set_volume(self.volume_musica * self.volume_general)
-            for s in [self.shoot_sound, self.damage_sound, self.death_sound, 
-                     self.click_sound, self.hover_sound, self.destroyed_sound]:
-                if s: s.set_volume(self.volume_efectos * self.volume_general)
+        self.audio.toggle_mute()
+
+    def apply_input(self, state):
+        if state.pause and not self.game_over and not self.victory:
+            if self.paused and self.pause_menu_state in ["options", "sound", "controls"]:
+                self.pause_menu_state = "main"
+            else:
+                self.paused = not self.paused
+                self.pause_menu_state = "main"
 
-    def update(self):
         if self.game_over or self.paused or self.victory:
             return
 
-        if not hasattr(self, 'level_shown'):
-            self.show_level_intro()
-            self.level_shown = True
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]:
+        if state.shoot and self.player.shoot(self.bullets):
+            self.audio.play('shoot')
+        if state.left:
             self.player.move("left", self.screen_width)
-        if keys[pygame.K_RIGHT]:
+        if state.right:
             self.player.move("right", self.screen_width)
 
-        self.player.update(self.screen_height)
+    def snapshot_positions(self):
+        """Guarda la posición de cada entidad antes del tick para interpolar el dibujo."""
+        self.player.prev_pos = self.player.rect.topleft
+        for entity in self.enemies:
+            entity.prev_pos = entity.rect.topleft
+        for entity in self.clouds:
+            entity.prev_pos = entity.rect.topleft
+        for entity in self.satellites:
+            entity.prev_pos = entity.rect.topleft
 
-        self.enemy_move_timer += 1
-        if self.enemy_move_timer >= self.enemy_move_interval:
-            self.enemy_move_timer = 0
-            hit_edge = False
-            
-            for enemy in self.enemies:
-                enemy.rect.x += enemy.speed * enemy.direction
-                enemy.try_shoot()
-                if enemy.rect.right >= self.screen_width or enemy.rect.left <= 0:
-                    hit_edge = True
+    def update(self):
+        """Avanza la simulación un tick de FIXED_DT segundos."""
+        self.tick += 1
+        self.snapshot_positions()
+        state = self.input.poll()
+        if self.level_banner.active and not self.paused:
+            # Mientras se muestra el rótulo del nivel solo se atiende la pausa
+            state = InputState(pause=state.pause)
+        self.apply_input(state)
 
-            if hit_edge:
-                for enemy in self.enemies:
-                    enemy.direction *= -1
-                    enemy.rect.y += enemy.move_down_distance
+        if self.game_over or self.paused or self.victory:
+            return
 
-        for enemy in self.enemies:
-            enemy.update_bullets(self.screen_height)
+        if self.level_banner.active:
+            # La simulación espera al rótulo también sin ventana, para que las repeticiones coincidan
+            self.level_banner.update(FIXED_DT)
+            return
 
+        self.player.update(self.screen_height, FIXED_DT)
+
+        self.enemy_move_timer += FIXED_DT
+        if self.enemy_move_timer >= self.enemy_move_interval - EPSILON:
+            self.enemy_move_timer -= self.enemy_move_interval
+            if self.formation.step():
+                self.formation.bounce()
+            self.collision_grid.invalidate_enemies()
+
+        self.fire_scheduler.update(self.bullets)
+
+        self.bullets.update(FIXED_DT)
+
+        for shield in self.shields:
+            shield.update(FIXED_DT)
+
+        self.profiler.lap('update')
         self.check_collisions()
+        self.profiler.lap('check_collisions')
 
         if self.level_manager.should_spawn_clouds(self.current_level):
-            self.cloud_spawn_timer += 1
-            if self.cloud_spawn_timer >= self.cloud_spawn_interval:
-                self.clouds.append(Cloud(self.screen_width, self.screen_height))
-                self.cloud_spawn_timer = 0
+            self.cloud_spawn_timer += FIXED_DT
+            if self.cloud_spawn_timer >= self.cloud_spawn_interval - EPSILON:
+                self.clouds.append(Cloud(self.screen_width, self.screen_height, self.rng))
+                self.cloud_spawn_timer -= self.cloud_spawn_interval
             for cloud in self.clouds[:]:
                 cloud.update()
                 if cloud.is_offscreen(self.screen_width):
                     self.clouds.remove(cloud)
 
         if self.level_manager.should_spawn_satellites(self.current_level):
-            self.satellite_spawn_timer += 1
+            self.satellite_spawn_timer += FIXED_DT
             if self.satellite_spawn_timer >= self.next_satellite_spawn_interval:
-                self.satellites.append(Satellite(self.screen_width, self.screen_height))
-                self.satellite_spawn_timer = 0
-                self.next_satellite_spawn_interval = random.randint(
+                self.satellites.append(Satellite(self.screen_width, self.screen_height, self.rng))
+                self.satellite_spawn_timer = 0.0
+                self.next_satellite_spawn_interval = self.rng.uniform(
                     self.satellite_spawn_interval_min, 
                     self.satellite_spawn_interval_max
                 )
@@ -258,124 +315,184 @@ class Game:
                     self.satellites.remove(satellite)
 
         if not self.enemies:
-            if self.current_level < self.max_levels:
+            self.input.checkpoint(self.current_level, self.state_hash())
+            if self.max_levels is None or self.current_level < self.max_levels:
+                self.finish_wave()
                 self.current_level += 1
                 self.save_progress()
                 self.load_level_background()
                 self.create_enemies()
                 self.play_level_music()
-                delattr(self, 'level_shown')
+                self.level_banner.show(self.current_level)
+                self.prefetch_levels()
             else:
                 self.victory = True
 
-        for enemy in self.enemies:
-            if enemy.rect.bottom >= self.player.rect.top:
-                self.game_over = True
-                self.delete_save()
-                break
+        bottom = self.formation.bottom
+        if bottom is not None and bottom >= self.player.rect.top:
+            self.game_over = True
+            self.delete_save()
+
+    def finish_wave(self):
+        """Cierra y muestra el informe de FPS de la oleada actual (solo en modo infinito y si se dibujó)."""
+        if self.wave_stats is None:
+            return None
+        report = self.wave_stats.finish(self.current_level, self.wave_size)
+        if report:
+            print(WaveStats.format(report))
+        return report
 
     def check_collisions(self):
-        # Colisiones de las balas del jugador con enemigos
-        for bullet in self.player.bullets[:]:
-            bullet_rect = pygame.Rect(bullet.x, bullet.y, bullet.width, bullet.height) if hasattr(bullet, 'width') else bullet.rect
-            for enemy in self.enemies[:]:
-                if bullet_rect.colliderect(enemy.rect):
-                    self.player.bullets.remove(bullet)
-                    enemy.receive_damage()
-                    if enemy.dead:
-                        self.enemies.remove(enemy)
-                        self.score += 10
-                    else:
-                        self.score += 5
-                    break
+        result = self.collision_grid.resolve(self.bullets, self.enemies, self.shields, self.player)
+
+        # Balas del jugador contra enemigos
+        self.score += 5 * len(result.hits)
+        for enemy in result.kills:
+            self.enemies.remove(enemy)
+            self.formation.remove(enemy)
+            self.fire_scheduler.remove(enemy)
+            self.score += 10
+
+        # Balas enemigas contra escudos
+        for shield in result.shields_destroyed:
+            self.shields.remove(shield)
+            self.audio.play('destroyed')
+
+        # Balas enemigas contra el jugador
+        for _ in range(result.player_hits):
+            # Durante la invulnerabilidad los impactos no dañan ni suenan
+            if self.player.damage_timer <= 0:
+                self.player.take_damage()
+                self.audio.play('damage')
+                if self.player.lives <= 0:
+                    self.audio.play('death')
+                    self.game_over = True
+                    self.delete_save()
+
+        self.bullets.remove(result.consumed)
+
+        # Las balas de un enemigo desaparecen con él
+        for enemy in result.kills:
+            self.bullets.kill_owner(enemy.uid)
+
+        return result
+
+    def draw(self, alpha=1.0):
+        """Dibuja el estado interpolado `alpha` entre el tick anterior y el actual."""
+        if not self.paused or self.game_over or self.victory:
+            self.pause_frame = None
+            self.pause_signature = None
+        elif self.pause_frame is not None:
+            self.draw_paused()
+            return
 
-        # Colisiones de las balas enemigas con escudos/jugador
-        for enemy in self.enemies:
-            for bullet in enemy.bullets[:]:
-                bullet_rect = bullet.rect if hasattr(bullet, 'rect') else pygame.Rect(bullet.x, bullet.y, bullet.width, bullet.height)
-                
-                # Con escudos
-                for shield in self.shields[:]:
-                    if bullet_rect.colliderect(shield.rect):
-                        enemy.bullets.remove(bullet)
-                        shield.take_damage()
-                        if shield.is_destroyed():
-                            self.shields.remove(shield)
-                            if self.destroyed_sound:
-                                self.destroyed_sound.play()
-                        break
-                        
-                # Con jugador
-                if bullet_rect.colliderect(self.player.rect):
-                    enemy.bullets.remove(bullet)
-                    if self.damage_sound:
-                        self.damage_sound.play()
-                    if self.player.damage_timer == 0:
-                        self.player.take_damage()
-                        if self.player.lives <= 0:
-                            if self.death_sound:
-                                self.death_sound.play()
-                            self.game_over = True
-                            self.delete_save()
-
-    def draw(self):
-        if self.level_background:
-            self.screen.blit(self.level_background, (0, 0))
+        renderer = self.renderer
+        if renderer:
+            # Los menús superpuestos y el perfilador cubren casi toda la pantalla: frame completo
+            overlay = (self.paused or self.game_over or self.victory or self.profiler.enabled
+                       or self.level_banner.active)
+            renderer.begin(self.level_background, full=overlay)
+            mark = renderer.add
         else:
-            self.screen.fill((0, 0, 0))
+            if self.level_background:
+                self.screen.blit(self.level_background, (0, 0))
+            else:
+                self.screen.fill((0, 0, 0))
+            mark = _ignore_rect
 
         if self.level_manager.should_spawn_clouds(self.current_level):
             for cloud in self.clouds:
-                cloud.draw(self.screen)
+                mark(cloud.draw(self.screen, alpha))
 
         if self.level_manager.should_spawn_satellites(self.current_level):
             for satellite in self.satellites:
-                satellite.draw(self.screen)
+                mark(satellite.draw(self.screen, alpha))
 
-        self.player.draw(self.screen)
+        mark(self.player.draw(self.screen, alpha))
 
         for enemy in self.enemies:
             if isinstance(enemy, FinalBoss):
-                health_bar_width = enemy.rect.width
-                health_ratio = max(enemy.lives / 20, 0)
-                pygame.draw.rect(self.screen, (255, 0, 0), (enemy.rect.x, enemy.rect.y - 15, health_bar_width, 10))
-                pygame.draw.rect(self.screen, (0, 255, 0), (enemy.rect.x, enemy.rect.y - 15, int(health_bar_width * health_ratio), 10))
-            enemy.draw(self.screen)
-
-        for bullet in self.player.bullets:
-            pygame.draw.rect(self.screen, (255, 255, 0), bullet)
-
-        for enemy in self.enemies:
-            for bullet in enemy.bullets:
-                if hasattr(bullet, "draw"):
-                    bullet.draw(self.screen)
-                else:
-                    pygame.draw.rect(self.screen, (255, 0, 0), bullet)
+                x, y = interpolate(enemy, alpha)
+                mark(self.screen.blit(self.hud.boss_bar(enemy.rect.width, enemy.lives, enemy.max_lives), (x, y - 15)))
+            mark(enemy.draw(self.screen, alpha))
+
+        self.bullets.draw(self.screen, alpha)
+        if renderer:
+            if renderer.fits(self.bullets.dirty_area()):
+                for rect in self.bullets.dirty_rects(alpha):
+                    renderer.add(rect)
+            else:
+                renderer.add_untracked()
 
-        lives_text = self.font.render(f"Vidas: {self.player.lives}", True, (255, 255, 255))
-        score_text = self.font.render(f"Puntaje: {self.score}", True, (255, 255, 255))
-        self.screen.blit(lives_text, (10, 10))
-        self.screen.blit(score_text, (self.screen_width - score_text.get_width() - 10, 10))
+        self.hud.update(self.player.lives, self.score)
+        for rect in self.hud.draw(self.screen):
+            mark(rect)
 
         for shield in self.shields:
-            shield.draw(self.screen)
+            mark(shield.draw(self.screen))
+
+        if self.level_banner.active:
+            self.level_banner.draw(self.screen)
 
-        if self.paused:
+        if self.paused and not self.game_over and not self.victory:
+            self.capture_pause_frame()
+            self.screen.blit(self.pause_frame, (0, 0))
             self.draw_pause_menu()
         if self.game_over:
             self.draw_game_over_menu()
         if self.victory:
             self.draw_victory_menu()
 
-        pygame.display.flip()
-
-    def draw_pause_menu(self):
+        if self.profiler.enabled:
+            self.profiler.draw(self.screen, self.entity_counts())
+        self.profiler.lap('draw')
+        if renderer:
+            renderer.present()
+        else:
+            pygame.display.flip()
+
+    def entity_counts(self):
+        bullets = self.bullets.count_by_kind()
+        return {
+            'enemigos': len(self.enemies),
+            'balas jugador': bullets['player'],
+            'balas rect': bullets['rect'],
+            'balas láser': bullets['laser'],
+            'balas radiales': bullets['orb'],
+            'nubes': len(self.clouds),
+            'satélites': len(self.satellites),
+            'escudos': len(self.shields),
+        }
+
+    def capture_pause_frame(self):
+        """Guarda el frame de juego actual con el oscurecimiento de la pausa ya aplicado."""
+        self.pause_frame = self.screen.copy()
         overlay = pygame.Surface((self.screen_width, self.screen_height))
         overlay.set_alpha(180)
         overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        self.pause_frame.blit(overlay, (0, 0))
+
+    def draw_paused(self):
+        """Pausa sobre el frame congelado: solo se recompone si cambia algo del menú."""
+        mouse_pos = pygame.mouse.get_pos()
+        signature = (self.pause_menu_state, self.audio.muted, tuple(self.audio.volumes.values()),
+                     tuple(rect.collidepoint(mouse_pos) for rect in self.pause_buttons))
+        if signature == self.pause_signature and not self.profiler.enabled:
+            self.profiler.lap('draw')
+            return
+        self.pause_signature = signature
+
+        self.screen.blit(self.pause_frame, (0, 0))
+        self.draw_pause_menu()
+        if self.profiler.enabled:
+            self.profiler.draw(self.screen, self.entity_counts())
+        self.profiler.lap('draw')
+        if self.renderer:
+            self.renderer.invalidate()
+        pygame.display.flip()
 
-        title = self.title_font.render("PAUSA", True, (255, 255, 0))
+    def draw_pause_menu(self):
+        title = text_cache.render(self.title_font, "PAUSA", (255, 255, 0))
         self.screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, 80))
 
         if self.pause_menu_state == "main":
@@ -392,11 +509,12 @@ class Game:
                 self.draw_button("Volver", self.screen_width // 2, 430)
             ]
         elif self.pause_menu_state == "sound":
-            overlay = pygame.Surface((self.screen_width - 100, 220))
-            overlay.set_alpha(220)
-            overlay.fill((30, 30, 30))
-            overlay_rect = overlay.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-            self.screen.blit(overlay, overlay_rect)
+            if self.sound_panel is None:
+                self.sound_panel = pygame.Surface((self.screen_width - 100, 220))
+                self.sound_panel.set_alpha(220)
+                self.sound_panel.fill((30, 30, 30))
+            overlay_rect = self.sound_panel.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
+            self.screen.blit(self.sound_panel, overlay_rect)
 
             self.draw_text("Ajustes de Sonido", self.screen_width // 2, overlay_rect.top + 30, self.font)
 
@@ -404,12 +522,12 @@ class Game:
             base_x = overlay_rect.left + 50
             base_y = overlay_rect.top + 70
 
-            self.draw_volume_slider("General", base_x, base_y, self.volume_general)
-            self.draw_volume_slider("Música", base_x, base_y + 60, self.volume_musica)
-            self.draw_volume_slider("Efectos", base_x, base_y + 120, self.volume_efectos)
+            self.draw_volume_slider("General", base_x, base_y, self.audio.get_volume("general"))
+            self.draw_volume_slider("Música", base_x, base_y + 60, self.audio.get_volume("musica"))
+            self.draw_volume_slider("Efectos", base_x, base_y + 120, self.audio.get_volume("efectos"))
 
             self.pause_buttons = [
-                self.draw_button("Activar sonido" if self.muted else "Silenciar", self.screen_width // 2, overlay_rect.bottom + 40, 200, 40),
+                self.draw_button("Activar sonido" if self.audio.muted else "Silenciar", self.screen_width // 2, overlay_rect.bottom + 40, 200, 40),
                 self.draw_button("Volver", self.screen_width // 2, overlay_rect.bottom + 100, 200, 40)
             ]
 
@@ -422,7 +540,7 @@ class Game:
         pygame.draw.rect(self.screen, (255, 255, 255), knob)
 
     def draw_text(self, text, x, y, font, color=(255, 255, 255)):
-        text_surf = font.render(text, True, color)
+        text_surf = text_cache.render(font, text, color)
         self.screen.blit(text_surf, text_surf.get_rect(center=(x, y)))
 
     def draw_button(self, text, x, y, w=250, h=60, 
@@ -435,18 +553,23 @@ class Game:
 
         if hovered and text not in self.hovered_pause_buttons:
             self.hovered_pause_buttons.add(text)
-            if self.hover_sound:
-                self.hover_sound.play()
+            self.audio.play('hover')
         elif not hovered:
             self.hovered_pause_buttons.discard(text)
 
-        color = hover_bg_color if hovered else bg_color
-        text_col = hover_text_color if hovered else text_color
-
-        pygame.draw.rect(self.screen, color, rect, border_radius=8)
-        pygame.draw.rect(self.screen, border_color, rect, 3, border_radius=8)
-        text_surf = self.font.render(text, True, text_col)
-        self.screen.blit(text_surf, text_surf.get_rect(center=rect.center))
+        key = (text, w, h, hovered)
+        button = self.button_cache.get(key)
+        if button is None:
+            color = hover_bg_color if hovered else bg_color
+            text_col = hover_text_color if hovered else text_color
+            button = pygame.Surface((w, h), pygame.SRCALPHA)
+            local = button.get_rect()
+            pygame.draw.rect(button, color, local, border_radius=8)
+            pygame.draw.rect(button, border_color, local, 3, border_radius=8)
+            text_surf = text_cache.render(self.font, text, text_col)
+            button.blit(text_surf, text_surf.get_rect(center=local.center))
+            self.button_cache[key] = button
+        self.screen.blit(button, rect)
 
         return rect
 
@@ -458,6 +581,8 @@ class Game:
 
         self.draw_text("GAME OVER", self.screen_width // 2, 100, self.title_font, (255, 0, 0))
         self.draw_text(f"Puntaje: {self.score}", self.screen_width // 2, 180, self.font)
+        if self.endless:
+            self.draw_text(f"Oleada alcanzada: {self.current_level}", self.screen_width // 2, 220, self.font)
 
         self.game_over_buttons = [
             self.draw_button("Reiniciar", self.screen_width // 2, 300),
@@ -472,7 +597,7 @@ class Game:
         self.screen.blit(overlay, (0, 0))
 
         self.draw_text("¡VICTORIA FINAL!", self.screen_width // 2, 100, self.title_font, (0, 255, 0))
-        self.draw_text("¡Has completado los 3 niveles!", self.screen_width // 2, 180, self.font)
+        self.draw_text(f"¡Has completado los {self.max_levels} niveles!", self.screen_width // 2, 180, self.font)
         self.draw_text(f"Puntuación final: {self.score}", self.screen_width // 2, 220, self.font)
 
         self.victory_buttons = [
@@ -481,7 +606,8 @@ class Game:
         ]
 
     def resume_game(self):
-        self.paused = False
+        # Se reanuda a través de la entrada para que quede grabado en las repeticiones
+        self.input.press(pygame.K_ESCAPE)
 
     def show_options(self):
         self.pause_menu_state = "options"
@@ -490,15 +616,24 @@ class Game:
         self.pause_menu_state = "main"
 
     def go_to_menu(self):
-        from .menu import Menu
-        menu = Menu()
-        menu.run()
+        self.running = False
+        if self.scenes is None:
+            return
+        if len(self.scenes.stack) > 1:
+            # El menú que lanzó la partida sigue debajo en la pila
+            self.scenes.pop()
+        else:
+            from .menu import Menu
+            self.scenes.replace(Menu(self.scenes))
 
     def quit_game(self):
         pygame.quit()
         sys.exit()
 
     def save_progress(self):
+        # El modo infinito no toca la partida guardada de la campaña
+        if self.headless or self.endless:
+            return
         try:
             with open(self.save_path, 'w') as f:
                 f.write(str(self.current_level))
@@ -506,33 +641,92 @@ class Game:
             print(f"Error guardando progreso: {e}")
 
     def delete_save(self):
+        if self.headless or self.endless:
+            return
         try:
             if os.path.exists(self.save_path):
                 os.remove(self.save_path)
         except Exception as e:
             print(f"Error eliminando progreso: {e}")
 
-    def run(self):
-        if self.show_intro_cinematic:
-            self.cinematics.show_intro()
-            self.show_intro_cinematic = False
-        
-        self.show_level_intro()
-        
-        while True:
-            self.clock.tick(self.fps)
-            self.handle_events()
+    def state_hash(self):
+        """Huella del estado de la simulación, usada para verificar repeticiones."""
+        h = hashlib.sha256()
+        h.update(repr((self.tick, self.current_level, self.score, self.player.lives,
+                       tuple(self.player.rect), self.rng.getstate())).encode())
+        for enemy in self.enemies:
+            h.update(repr((type(enemy).__name__, tuple(enemy.rect), enemy.lives)).encode())
+        for shield in self.shields:
+            h.update(repr((tuple(shield.rect), shield.life)).encode())
+        n = self.bullets.count
+        for name in ('x', 'y', 'vx', 'vy', 'kind'):
+            h.update(getattr(self.bullets, name)[:n].tobytes())
+        return h.hexdigest()
+
+    def simulate(self, max_frames):
+        """Avanza la simulación sin dibujar ni esperar; devuelve los ticks ejecutados."""
+        for frame in range(max_frames):
             self.update()
-            self.draw()
-            
             if self.game_over or self.victory:
+                return frame + 1
+        return max_frames
+
+    def play_cinematic(self, frame_time):
+        """Avanza la cinemática activa un frame; devuelve False cuando ha terminado."""
+        Cinematics.handle_events(self.cinematic)
+        self.cinematic.update(frame_time)
+        if self.cinematic.finished:
+            self.cinematic = None
+            if self.renderer:
+                self.renderer.invalidate()
+            return False
+        if self.cinematic.draw(self.screen):
+            pygame.display.flip()
+        return True
+
+    def run(self):
+        ending = False
+        while self.running:
+            frame_time = self.clock.tick(self.fps) / 1000
+            self.audio.update()
+            if self.cinematic:
+                if self.play_cinematic(frame_time):
+                    continue
+                if ending:
+                    break
+                # Fin de la introducción: el fondo del nivel ya está leído en segundo plano
+                self.load_level_background()
+                self.timestep.accumulator = 0.0
+                continue
+
+            self.profiler.start_frame()
+            self.handle_events()
+            self.profiler.lap('handle_events')
+            if not self.running:
                 break
-        
-        if self.game_over:
-            self.cinematics.show_ending(victory=False)
-        elif self.victory:
-            self.cinematics.show_ending(victory=True)
-        
-        from .menu import Menu
-        menu = Menu()
-        menu.run()
\ No newline at end of file
+            if self.headless:
+                # Sin ventana no hay nada que sincronizar: un tick por iteración
+                ticks, alpha = 1, 1.0
+            else:
+                ticks = self.timestep.advance(frame_time)
+                alpha = self.timestep.alpha
+            for _ in range(ticks):
+                self.update()
+                if self.game_over or self.victory:
+                    break
+            self.profiler.lap('update')
+            self.draw(alpha)
+            self.profiler.lap('flip')
+            self.profiler.end_frame()
+            if self.wave_stats and not self.paused:
+                self.wave_stats.frame(frame_time)
+
+            if self.game_over or self.victory:
+                self.finish_wave()
+                if self.headless:
+                    return
+                self.cinematic = self.cinematics.ending(victory=self.victory)
+                ending = True
+
+        if self.running:
+            self.go_to_menu()
\ No newline at end of file
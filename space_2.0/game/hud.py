@@ -0,0 +1,115 @@
+import pygame
+from collections import OrderedDict
+from .timestep import countdown
+
+
+class TextCache:
+    """Caché LRU de textos ya renderizados, compartida por el juego y los menús."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+
+text_cache = TextCache()
+
+
+class HUD:
+    """Capa del HUD (vidas y puntaje) que solo se redibuja cuando cambia un valor."""
+
+    def __init__(self, screen_width, font, height=40, color=(255, 255, 255)):
+        self.screen_width = screen_width
+        self.font = font
+        self.color = color
+        self.layer = pygame.Surface((screen_width, height), pygame.SRCALPHA)
+        self.values = {}  # elemento -> último valor dibujado
+        self.rects = {}   # elemento -> zona que ocupa en la capa
+        self.boss_bars = {}  # (ancho, vidas, vidas máximas) -> barra de vida del jefe
+
+    def _set_text(self, element, value, text, align_right=False):
+        if self.values.get(element) == value:
+            return
+        self.values[element] = value
+        old = self.rects.get(element)
+        if old:
+            self.layer.fill((0, 0, 0, 0), old)
+        surface = text_cache.render(self.font, text, self.color)
+        if align_right:
+            rect = surface.get_rect(topright=(self.screen_width - 10, 10))
+        else:
+            rect = surface.get_rect(topleft=(10, 10))
+        self.layer.blit(surface, rect)
+        self.rects[element] = rect
+
+    def update(self, lives, score):
+        self._set_text('lives', lives, f"Vidas: {lives}")
+        self._set_text('score', score, f"Puntaje: {score}", align_right=True)
+
+    def draw(self, screen):
+        """Dibuja los elementos de la capa y devuelve las zonas tocadas."""
+        return [screen.blit(self.layer, rect, rect) for rect in self.rects.values()]
+
+    def boss_bar(self, width, lives, max_lives=20):
+        """Barra de vida del jefe; se genera una vez por cada valor de vida."""
+        key = (width, lives, max_lives)
+        bar = self.boss_bars.get(key)
+        if bar is None:
+            bar = pygame.Surface((width, 10))
+            bar.fill((255, 0, 0))
+            health_ratio = max(lives / max_lives, 0)
+            bar.fill((0, 255, 0), (0, 0, int(width * health_ratio), 10))
+            self.boss_bars[key] = bar
+        return bar
+
+
+class LevelBanner:
+    """Rótulo "Nivel N" que se muestra sobre el juego durante `duration` segundos de simulación."""
+
+    def __init__(self, screen_width, screen_height, duration=1.5, label="Nivel"):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.duration = duration
+        self.label = label
+        self.timer = 0.0
+        self.level = None
+        self.font = None
+        self.overlay = None
+
+    @property
+    def active(self):
+        return self.timer > 0
+
+    def show(self, level):
+        self.level = level
+        self.timer = self.duration
+
+    def hide(self):
+        self.timer = 0.0
+
+    def update(self, dt):
+        self.timer = countdown(self.timer, dt)
+
+    def draw(self, screen):
+        if self.overlay is None:
+            self.font = pygame.font.SysFont(None, 72)
+            self.overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 128))
+        level_text = text_cache.render(self.font, f"{self.label} {self.level}", (255, 255, 255))
+        screen.blit(self.overlay, (0, 0))
+        screen.blit(level_text, level_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2)))
@@ -0,0 +1,62 @@
+import pygame
+
+
+class InputState:
+    """Entrada del jugador en un tick: teclas mantenidas y pulsaciones nuevas."""
+
+    __slots__ = ('left', 'right', 'shoot', 'pause')
+
+    def __init__(self, left=False, right=False, shoot=False, pause=False):
+        self.left = left      # flecha izquierda mantenida
+        self.right = right    # flecha derecha mantenida
+        self.shoot = shoot    # barra espaciadora pulsada en este tick
+        self.pause = pause    # escape pulsado en este tick
+
+
+class KeyboardInput:
+    """Lee el teclado real; las pulsaciones llegan desde Game.handle_events."""
+
+    def __init__(self):
+        self.pending_shoot = False
+        self.pending_pause = False
+
+    def press(self, key):
+        if key == pygame.K_SPACE:
+            self.pending_shoot = True
+        elif key == pygame.K_ESCAPE:
+            self.pending_pause = True
+
+    def poll(self):
+        keys = pygame.key.get_pressed()
+        state = InputState(keys[pygame.K_LEFT], keys[pygame.K_RIGHT],
+                           self.pending_shoot, self.pending_pause)
+        self.pending_shoot = False
+        self.pending_pause = False
+        return state
+
+    def checkpoint(self, level, state_hash):
+        pass
+
+
+class ScriptedInput:
+    """Reproduce una secuencia de InputState (o tuplas left, right, shoot, pause), una por tick.
+
+    Cuando el guion se agota se devuelve una entrada vacía.
+    """
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    def press(self, key):
+        pass
+
+    def poll(self):
+        frame = next(self.frames, None)
+        if frame is None:
+            return InputState()
+        if isinstance(frame, InputState):
+            return frame
+        return InputState(*frame)
+
+    def checkpoint(self, level, state_hash):
+        pass
@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from .assets import LEVELS_DIR, LEVEL_CACHE_DIR
+from .enemy import BasicEnemy, StrongEnemy, FinalBoss, RadialEnemy
+from .shield import SHIELD_SIZE
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: solo niveles en JSON
+    tomllib = None
+
+# Cambiarlo invalida todos los planes guardados en LEVEL_CACHE_DIR
+COMPILER_VERSION = 2
+
+LEVEL_EXTENSIONS = ('.json', '.toml')
+
+# Nombre de tipo en los archivos de nivel -> clase de enemigo
+ENEMY_TYPES = {
+    'basic': BasicEnemy,
+    'strong': StrongEnemy,
+    'radial': RadialEnemy,
+    'boss': FinalBoss,
+}
+# Tipos cuya cadencia no escala con el número de nivel
+UNSCALED_TYPES = {'boss'}
+
+HAZARDS = ('clouds', 'satellites')
+PATTERNS = ('lines', 'checker')
+
+
+class LevelFileError(ValueError):
+    """Archivo de nivel ilegible o que no cumple el esquema."""
+
+
+class SpawnGroup:
+    """Enemigos de una formación ya resueltos: un tipo por enemigo y su posición.
+
+    Si `positions` es None las posiciones se sortean al crear el nivel dentro de
+    `x_range` e `y_range`, con el generador del juego para que la partida sea reproducible.
+    `size` sustituye el tamaño de sprite de los tipos (oleadas con muchos enemigos).
+    """
+
+    def __init__(self, types, positions=None, x_range=None, y_range=None,
+                 bullet_speed=3, lives=None, fire_rate=None, size=None):
+        self.types = types
+        self.positions = positions
+        self.x_range = x_range
+        self.y_range = y_range
+        self.bullet_speed = bullet_speed
+        self.lives = lives
+        self.fire_rate = fire_rate
+        self.size = size
+
+
+class LevelPlan:
+    """Nivel compilado: todo lo que necesita `LevelManager` sin volver a leer el archivo."""
+
+    def __init__(self, background, music, clouds, satellites, shields, groups):
+        self.background = background
+        self.music = music
+        self.clouds = clouds
+        self.satellites = satellites
+        self.shields = shields  # [(x, y, indestructible)]
+        self.groups = groups
+        # Pares (tipo, tamaño) del nivel en orden de aparición, para adelantar sus imágenes
+        self.enemy_sprites = list(dict.fromkeys((name, group.size) for group in groups for name in group.types))
+
+
+def level_files(directory=LEVELS_DIR):
+    """Archivos de nivel ordenados por nombre; el primero es el nivel 1."""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [os.path.join(directory, name) for name in names
+            if os.path.splitext(name)[1] in LEVEL_EXTENSIONS]
+
+
+def load_plans(screen_width, screen_height, directory=LEVELS_DIR, cache_dir=LEVEL_CACHE_DIR):
+    """Planes de todos los niveles de `directory`, numerados desde 1."""
+    return {number: load_plan(path, screen_width, screen_height, cache_dir)
+            for number, path in enumerate(level_files(directory), start=1)}
+
+
+def load_plan(path, screen_width, screen_height, cache_dir=LEVEL_CACHE_DIR):
+    """Plan compilado del archivo `path`.
+
+    La clave de la caché es el hash del contenido del archivo (más el tamaño de
+    pantalla y la versión del compilador), así que un archivo sin cambios se carga
+    directamente del plan guardado sin parsearlo ni validarlo; cualquier edición
+    produce otra clave y se recompila.
+    """
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError as e:
+        raise LevelFileError(f"{path}: no se puede leer ({e})") from e
+
+    key = hashlib.sha256(repr((COMPILER_VERSION, screen_width, screen_height,
+                               os.path.splitext(path)[1])).encode() + content).hexdigest()
+    cache_path = os.path.join(cache_dir, key + '.pickle')
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Plan de nivel en caché inválido {cache_path}: {e}")
+
+    plan = compile_level(parse_level(path, content), screen_width, screen_height, path)
+    _store(cache_path, plan)
+    return plan
+
+
+def _store(cache_path, plan):
+    # Escritura atómica: otro proceso nunca ve un plan a medio escribir
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"No se pudo guardar el plan de nivel {cache_path}: {e}")
+
+
+def parse_level(path, content):
+    extension = os.path.splitext(path)[1]
+    try:
+        if extension == '.toml':
+            if tomllib is None:
+                raise LevelFileError(f"{path}: los niveles TOML necesitan Python 3.11 o superior")
+            return tomllib.loads(content.decode('utf-8'))
+        return json.loads(content.decode('utf-8'))
+    except LevelFileError:
+        raise
+    except Exception as e:
+        raise LevelFileError(f"{path}: {e}") from e
+
+
+# --- Validación ---
+
+def _get(obj, key, where, kinds, default=None, required=False):
+    if key not in obj:
+        if required:
+            raise LevelFileError(f"{where}: falta '{key}'")
+        return default
+    value = obj[key]
+    # bool es subclase de int: no se acepta donde se espera un número
+    if not isinstance(value, kinds) or (isinstance(value, bool) and bool not in kinds):
+        names = '/'.join(kind.__name__ for kind in kinds)
+        raise LevelFileError(f"{where}: '{key}' debe ser {names}, no {value!r}")
+    return value
+
+
+def _positive(obj, key, where, kinds=(int,), default=None, required=False):
+    value = _get(obj, key, where, kinds, default, required)
+    if value is not None and value <= 0:
+        raise LevelFileError(f"{where}: '{key}' debe ser mayor que 0")
+    return value
+
+
+def _enemy_type(name, where):
+    if not isinstance(name, str) or name not in ENEMY_TYPES:
+        raise LevelFileError(f"{where}: tipo de enemigo desconocido {name!r} "
+                             f"(válidos: {', '.join(ENEMY_TYPES)})")
+    return name
+
+
+def _margin(obj, where, screen_width, default=None):
+    value = _get(obj, 'margin', where, (int,), default)
+    if value is not None and (value < 0 or 2 * value > screen_width):
+        raise LevelFileError(f"{where}: 'margin' debe estar entre 0 y la mitad de la pantalla")
+    return value
+
+
+def _range(obj, key, where, required=True):
+    value = _get(obj, key, where, (list,), required=required)
+    if value is None:
+        return None
+    if (len(value) != 2 or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)
+            or value[0] > value[1]):
+        raise LevelFileError(f"{where}: '{key}' debe ser [mínimo, máximo] en píxeles")
+    return tuple(value)
+
+
+def _unknown_keys(obj, allowed, where):
+    unknown = set(obj) - set(allowed)
+    if unknown:
+        raise LevelFileError(f"{where}: claves desconocidas {sorted(unknown)}")
+
+
+_LEVEL_KEYS = ('background', 'music', 'hazards', 'shields', 'formations')
+_SHIELD_KEYS = ('count', 'indestructible', 'bottom')
+_FORMATION_KEYS = {
+    'grid': ('type', 'enemies', 'pattern', 'rows', 'cols', 'x', 'y', 'dx', 'dy', 'margin',
+             'bullet_speed', 'lives', 'fire_rate'),
+    'single': ('type', 'enemy', 'x', 'y', 'bullet_speed', 'lives', 'fire_rate'),
+    'random': ('type', 'enemy', 'count', 'margin', 'y', 'bullet_speed', 'lives', 'fire_rate'),
+}
+
+
+def compile_level(data, screen_width, screen_height, path='<nivel>'):
+    """Valida el contenido de un archivo de nivel y lo convierte en un `LevelPlan`.
+
+    Esquema (las claves sin valor por defecto son obligatorias)::
+
+        background  imagen de fondo
+        music       pista de música (opcional)
+        hazards     lista con "clouds" y/o "satellites" (opcional)
+        shields     {count, indestructible=false, bottom=150} (opcional)
+        formations  lista de formaciones, cada una con "type":
+            grid    rejilla rows x cols de `enemies` (pattern "lines" o "checker"),
+                    desde (x, y) separadas dx/dy, o repartidas a lo ancho con `margin`
+            single  un `enemy` en (x, y); x puede ser "center"
+            random  `count` enemigos `enemy` en x dentro de [margin, ancho - margin]
+                    e y dentro del rango `y`
+
+    Todas las formaciones aceptan bullet_speed (3 por defecto) y, opcionalmente,
+    lives y fire_rate para sustituir los valores del tipo de enemigo.
+    """
+    if not isinstance(data, dict):
+        raise LevelFileError(f"{path}: el nivel debe ser un objeto")
+    _unknown_keys(data, _LEVEL_KEYS, path)
+
+    background = _get(data, 'background', path, (str,), required=True)
+    music = _get(data, 'music', path, (str,))
+
+    hazards = _get(data, 'hazards', path, (list,), default=[])
+    for hazard in hazards:
+        if hazard not in HAZARDS:
+            raise LevelFileError(f"{path}: peligro desconocido {hazard!r} (válidos: {', '.join(HAZARDS)})")
+
+    shields = []
+    shield_data = _get(data, 'shields', path, (dict,))
+    if shield_data is not None:
+        where = f"{path}: shields"
+        _unknown_keys(shield_data, _SHIELD_KEYS, where)
+        count = _positive(shield_data, 'count', where, required=True)
+        indestructible = _get(shield_data, 'indestructible', where, (bool,), default=False)
+        bottom = _positive(shield_data, 'bottom', where, default=150)
+        if not SHIELD_SIZE[1] <= bottom <= screen_height:
+            raise LevelFileError(f"{where}: 'bottom' debe estar entre {SHIELD_SIZE[1]} y {screen_height} "
+                                 f"para que los escudos queden en pantalla")
+        spacing = screen_width // (count + 1)
+        shields = [(spacing * (i + 1) - SHIELD_SIZE[0] // 2, screen_height - bottom, indestructible)
+                   for i in range(count)]
+
+    formations = _get(data, 'formations', path, (list,), required=True)
+    if not formations:
+        raise LevelFileError(f"{path}: 'formations' no puede estar vacía")
+    groups = [_compile_formation(formation, f"{path}: formations[{i}]", screen_width)
+              for i, formation in enumerate(formations)]
+
+    return LevelPlan(background, music, 'clouds' in hazards, 'satellites' in hazards, shields, groups)
+
+
+def _compile_formation(formation, where, screen_width):
+    if not isinstance(formation, dict):
+        raise LevelFileError(f"{where}: la formación debe ser un objeto")
+    kind = _get(formation, 'type', where, (str,), required=True)
+    if kind not in _FORMATION_KEYS:
+        raise LevelFileError(f"{where}: tipo de formación desconocido {kind!r} "
+                             f"(válidos: {', '.join(_FORMATION_KEYS)})")
+    _unknown_keys(formation, _FORMATION_KEYS[kind], where)
+
+    options = {
+        'bullet_speed': _positive(formation, 'bullet_speed', where, (int, float), default=3),
+        'lives': _positive(formation, 'lives', where),
+        'fire_rate': _get(formation, 'fire_rate', where, (int, float)),
+    }
+    if options['fire_rate'] is not None and options['fire_rate'] < 0:
+        raise LevelFileError(f"{where}: 'fire_rate' no puede ser negativo")
+
+    if kind == 'grid':
+        enemies = _get(formation, 'enemies', where, (list,), required=True)
+        if not enemies:
+            raise LevelFileError(f"{where}: 'enemies' no puede estar vacía")
+        enemies = [_enemy_type(name, where) for name in enemies]
+        pattern = _get(formation, 'pattern', where, (str,), default='lines')
+        if pattern not in PATTERNS:
+            raise LevelFileError(f"{where}: patrón desconocido {pattern!r} (válidos: {', '.join(PATTERNS)})")
+        rows = _positive(formation, 'rows', where, required=True)
+        cols = _positive(formation, 'cols', where, required=True)
+        y = _get(formation, 'y', where, (int,), required=True)
+        dy = _get(formation, 'dy', where, (int,), required=True)
+        margin = _margin(formation, where, screen_width)
+        if margin is None:
+            x = _get(formation, 'x', where, (int,), required=True)
+            dx = _get(formation, 'dx', where, (int,), required=True)
+            columns = [x + col * dx for col in range(cols)]
+        elif 'x' in formation or 'dx' in formation:
+            raise LevelFileError(f"{where}: usa 'margin' o bien 'x' y 'dx', no ambos")
+        else:
+            columns = [margin + (col * (screen_width - 2 * margin) // cols) for col in range(cols)]
+
+        types, positions = [], []
+        for row in range(rows):
+            for col in range(cols):
+                index = row + col if pattern == 'checker' else row
+                types.append(enemies[index % len(enemies)])
+                positions.append((columns[col], y + row * dy))
+        return SpawnGroup(types, positions, **options)
+
+    enemy = _enemy_type(_get(formation, 'enemy', where, (str,), required=True), where)
+    if kind == 'single':
+        x = _get(formation, 'x', where, (int, str), required=True)
+        if isinstance(x, str):
+            if x != 'center':
+                raise LevelFileError(f"{where}: 'x' debe ser un número o \"center\"")
+            x = (screen_width - ENEMY_TYPES[enemy].IMAGE_SIZE[0]) // 2
+        y = _get(formation, 'y', where, (int,), required=True)
+        return SpawnGroup([enemy], [(x, y)], **options)
+
+    count = _positive(formation, 'count', where, required=True)
+    margin = _margin(formation, where, screen_width, default=0)
+    return SpawnGroup([enemy] * count, None, (margin, screen_width - margin),
+                      _range(formation, 'y', where), **options)
@@ -1,153 +1,109 @@
-import pygame
-import os
 import random
-import math
-from .enemy import BasicEnemy, StrongEnemy, FinalBoss, RadialEnemy
-from .shield import Shield
+from .shield import Shield, SHIELD_IMAGE, SHIELD_SIZE
+from .assets import sprite_cache
+from .level_files import ENEMY_TYPES, UNSCALED_TYPES, load_plans
 
 class LevelManager:
-    def __init__(self, screen_width, screen_height):
+    """Niveles de la partida, definidos en los archivos de `levels/` (ver `level_files`).
+
+    Cada archivo se compila una vez a un `LevelPlan` guardado en disco, así que
+    añadir o cambiar niveles no requiere tocar código. Con `waves` (un
+    `WaveGenerator`, modo infinito) los niveles son oleadas generadas al pedirlas.
+    """
+
+    def __init__(self, screen_width, screen_height, rng=random, levels=None, waves=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        self.level_config = {
-            1: {
-                'background': 'lvl1.png',
-                'enemy_rows': 2,
-                'enemy_cols': 6,
-                'enemy_type': BasicEnemy,
-                'clouds': False,
-                'satellites': False,
-                'shields': False,
-                'music': 'musica_nivel1.mp3'
-            },
-            2: {
-                'background': 'lvl2.png',
-                'enemy_mix': True,
-                'mix_rows': 3,
-                'mix_cols': 7,
-                'pattern': 'checker',
-                'bullet_speed': 4,
-                'clouds': True,
-                'satellites': False,
-                'shields': True,
-                'music': 'musica_nivel2.mp3'
-            },
-            3: {
-                'background': 'lvl3.png',
-                'boss': True,
-                'minion_type': RadialEnemy,  
-                'minions_count': 4,
-                'minion_bullet_speed': 3,  
-                'clouds': False,
-                'satellites': True,
-                'shields': True,
-                'music': 'musica_jefe_final.mp3',
-                'boss_bullet_speed': 6  
-            }
-        }
+        self.rng = rng  # generador compartido con el juego para poder reproducir partidas
+        self.waves = waves
+        if levels is None:
+            levels = {} if waves else load_plans(screen_width, screen_height)
+        self.levels = levels
+
+    @property
+    def level_count(self):
+        """Número de niveles, o None si son infinitos."""
+        return None if self.waves else len(self.levels)
+
+    def plan(self, level):
+        plan = self.levels.get(level)
+        if plan is None and self.waves and level >= 1:
+            plan = self.levels[level] = self.waves.plan(level)
+            # Se conservan la oleada recién generada y las dos anteriores: como la precarga
+            # pide siempre la siguiente, en partida son la anterior, la actual y la siguiente
+            for old in [old for old in self.levels if old < level - 2]:
+                del self.levels[old]
+        return plan
 
     def load_level_background(self, level):
-        if level not in self.level_config:
-            return None
-            
-        bg_name = self.level_config[level]['background']
-        try:
-            path = os.path.join(self.base_path, 'images', bg_name)
-            background = pygame.image.load(path).convert()
-            return pygame.transform.scale(background, (self.screen_width, self.screen_height))
-        except Exception as e:
-            print(f"Error al cargar fondo {bg_name}: {e}")
+        plan = self.plan(level)
+        if not plan:
             return None
 
+        bg_name = plan.background
+        return sprite_cache.load(bg_name, (self.screen_width, self.screen_height),
+                                 alpha=False, fallback_color=(0, 0, 0))
+
+    def level_images(self, level):
+        """Imágenes que usa el nivel como pares (archivo, tamaño), con el fondo al final por ser la más pesada."""
+        plan = self.plan(level)
+        if not plan:
+            return []
+        images = [(ENEMY_TYPES[name].IMAGE, size or ENEMY_TYPES[name].IMAGE_SIZE)
+                  for name, size in plan.enemy_sprites]
+        if plan.shields:
+            images.append((SHIELD_IMAGE, SHIELD_SIZE))
+        # Nubes y satélites tienen tamaño aleatorio: solo se adelanta la lectura del archivo
+        if plan.clouds:
+            images += [('nube1.png', None), ('nube2.png', None)]
+        if plan.satellites:
+            images.append(('satelite1.png', None))
+        images.append((plan.background, (self.screen_width, self.screen_height)))
+        return images
+
     def create_enemies(self, level):
-        config = self.level_config.get(level, {})
+        plan = self.plan(level)
+        if not plan:
+            return []
         enemies = []
-
-        if config.get('boss', False):
-            # Configuración del jefe final
-            boss = FinalBoss(
-                x=self.screen_width // 2 - 90,
-                y=50,
-                bullet_speed=config.get('boss_bullet_speed', 6)
-            )
-            boss.lives = 20
-            boss.shoot_probability = 0.5
-            enemies.append(boss)
-            
-            # Crear minions radiales
-            MinionClass = config.get('minion_type', RadialEnemy)
-            minion_bullet_speed = config.get('minion_bullet_speed', 3)
-            
-            for i in range(config.get('minions_count', 6)):
-                x = random.randint(100, self.screen_width - 100)
-                y = random.randint(50, 200)
-                enemies.append(MinionClass(x, y, bullet_speed=minion_bullet_speed, level=level))
-                
-        elif config.get('enemy_mix', False):
-            # Nivel 2 - Mezcla de enemigos
-            rows = config.get('mix_rows', 3)
-            cols = config.get('mix_cols', 7)
-            pattern = config.get('pattern', 'checker')
-            bullet_speed = config.get('bullet_speed', 3)
-            
-            for row in range(rows):
-                for col in range(cols):
-                    x = 100 + (col * (self.screen_width - 200) // cols)
-                    y = 80 + (row * 70)
-                    
-                    if pattern == 'checker':
-                        if (row + col) % 2 == 0:
-                            enemy = BasicEnemy(x, y, bullet_speed, level)
-                        else:
-                            enemy = StrongEnemy(x, y, bullet_speed, level)
-                    elif pattern == 'lines':
-                        if row % 2 == 0:
-                            enemy = BasicEnemy(x, y, bullet_speed, level)
-                        else:
-                            enemy = StrongEnemy(x, y, bullet_speed, level)
-                    
-                    enemies.append(enemy)
-        else:
-            # Nivel 1 - Enemigos básicos
-            rows = config.get('enemy_rows', 2)
-            cols = config.get('enemy_cols', 6)
-            
-            for row in range(rows):
-                for col in range(cols):
-                    x = 100 + (col * 100)
-                    y = 80 + (row * 60)
-                    enemies.append(BasicEnemy(x, y, bullet_speed=2, level=level))
-        
+        for group in plan.groups:
+            positions = group.positions
+            if positions is None:
+                # Posiciones aleatorias: se sortean ahora con el generador del juego
+                positions = [(self.rng.randint(*group.x_range), self.rng.randint(*group.y_range))
+                             for _ in group.types]
+            for name, (x, y) in zip(group.types, positions):
+                enemy_type = ENEMY_TYPES[name]
+                if name in UNSCALED_TYPES:
+                    enemy = enemy_type(x, y, bullet_speed=group.bullet_speed, image_size=group.size)
+                else:
+                    enemy = enemy_type(x, y, bullet_speed=group.bullet_speed, level=level,
+                                       image_size=group.size)
+                if group.size:
+                    # Sprites reducidos: la formación baja en proporción a su tamaño
+                    enemy.move_down_distance = max(4, enemy.move_down_distance * group.size[0]
+                                                   // enemy_type.IMAGE_SIZE[0])
+                if group.lives is not None:
+                    enemy.lives = enemy.max_lives = group.lives
+                if group.fire_rate is not None:
+                    enemy.fire_rate = group.fire_rate
+                enemies.append(enemy)
         return enemies
 
     def create_shields(self, level):
-        if not self.level_config.get(level, {}).get('shields', False):
+        plan = self.plan(level)
+        if not plan:
             return []
-        
-        shields = []
-        shield_y = self.screen_height - 150
-        spacing = self.screen_width // 4
-        
-        # Escudos indestructibles solo en nivel 3
-        indestructible = (level == 3)
-        
-        for i in range(3):
-            shield_x = spacing * (i + 1) - 30
-            shields.append(Shield(
-                shield_x, 
-                shield_y,
-                indestructible=indestructible  # Pasamos el parámetro
-            ))
-        
-        return shields
+        return [Shield(x, y, indestructible=indestructible) for x, y, indestructible in plan.shields]
 
     def get_level_music(self, level):
-        return self.level_config.get(level, {}).get('music')
+        plan = self.plan(level)
+        return plan.music if plan else None
 
     def should_spawn_clouds(self, level):
-        return self.level_config.get(level, {}).get('clouds', False)
+        plan = self.plan(level)
+        return plan.clouds if plan else False
 
     def should_spawn_satellites(self, level):
-        return self.level_config.get(level, {}).get('satellites', False)
\ No newline at end of file
+        plan = self.plan(level)
+        return plan.satellites if plan else False
@@ -1,67 +1,33 @@
 import pygame
 import sys
 import os
-import gif_pygame
 from .game import Game
+from .hud import text_cache
+from .assets import AnimatedBackground
+from .level_files import level_files
 
 class Menu:
-    def __init__(self):
-        pygame.init()
-        self.screen_width = 800
-        self.screen_height = 600
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Menú Principal - Invasión Espacial")
+    def __init__(self, scenes):
+        # La ventana, el mezclador y las cachés pertenecen al gestor de escenas
+        self.scenes = scenes
+        self.screen_width = scenes.screen_width
+        self.screen_height = scenes.screen_height
+        self.screen = scenes.screen
 
         BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        gif_path = os.path.join(BASE_DIR, 'images', 'fondo_menu.gif')
-        self.background_gif = gif_pygame.load(gif_path)
+        self.background_gif = AnimatedBackground('fondo_menu.gif', (self.screen_width, self.screen_height))
         self.title = pygame.image.load(os.path.join(BASE_DIR, 'images', 'titulo.png')).convert_alpha()
 
         self.font = pygame.font.SysFont(None, 40)
         self.small_font = pygame.font.SysFont(None, 30)
 
-        self.clock = pygame.time.Clock()
+        self.clock = scenes.clock
         self.state = "menu"
 
-        # Volúmenes iniciales (valores entre 0 y 1)
-        self.volume_general = 0.5
-        self.volume_musica = 0.5
-        self.volume_efectos = 0.5
-
-        self.muted = False
-        self.saved_volumes = {
-            "general": self.volume_general,
-            "musica": self.volume_musica,
-            "efectos": self.volume_efectos
-        }
-
-        # Música de fondo
-        try:
-            pygame.mixer.init()
-            music_path = os.path.join(BASE_DIR, 'sounds', 'menu_principal.mp3')
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(self.volume_general * self.volume_musica)
-            pygame.mixer.music.play(-1)
-        except Exception as e:
-            print(f"Error al cargar la música del menú: {e}")
-
-        # Sonido al pasar el mouse por botones
-        try:
-            hover_sound_path = os.path.join(BASE_DIR, 'sounds', 'seleccionar_menu.mp3')
-            self.hover_sound = pygame.mixer.Sound(hover_sound_path)
-            self.hover_sound.set_volume(self.volume_general * self.volume_efectos)
-        except Exception as e:
-            print(f"Error cargando sonido de selección de menú: {e}")
-            self.hover_sound = None
-
-        # Sonido al hacer clic en un botón
-        try:
-            click_sound_path = os.path.join(BASE_DIR, 'sounds', 'eleccion_menu.mp3')
-            self.click_sound = pygame.mixer.Sound(click_sound_path)
-            self.click_sound.set_volume(self.volume_general * self.volume_efectos)
-        except Exception as e:
-            print(f"Error cargando sonido de elección de menú: {e}")
-            self.click_sound = None
+        # Efectos y bus de volumen compartidos con la partida
+        self.audio = scenes.audio
+        self.music_file = 'menu_principal.mp3'
+        self.audio.music.prefetch(self.music_file)
 
         self.hovered_buttons = set()  # Para evitar repetir sonido
 
@@ -75,13 +41,29 @@ class Menu:
             "efectos": pygame.Rect(self.slider_start_x, 370, self.slider_width, self.slider_height)
         }
         self.knobs = {
-            "general": pygame.Rect(self.slider_start_x + int(self.volume_general * self.slider_width) - 5, 225, 10, 30),
-            "musica": pygame.Rect(self.slider_start_x + int(self.volume_musica * self.slider_width) - 5, 295, 10, 30),
-            "efectos": pygame.Rect(self.slider_start_x + int(self.volume_efectos * self.slider_width) - 5, 365, 10, 30)
+            "general": pygame.Rect(0, 225, 10, 30),
+            "musica": pygame.Rect(0, 295, 10, 30),
+            "efectos": pygame.Rect(0, 365, 10, 30)
         }
         self.dragging = None  # Indica qué slider se está arrastrando: "general", "musica" o "efectos"
+        self.update_sliders()
+
+        self.saved_level = self.load_progress()
 
+    def on_enter(self):
+        """Se llama cada vez que el menú vuelve a la cima de la pila de escenas."""
+        pygame.display.set_caption("Menú Principal - Invasión Espacial")
+        self.state = "menu"
+        self.hovered_buttons.clear()
         self.saved_level = self.load_progress()
+        self.update_sliders()  # el volumen puede haber cambiado dentro de la partida
+        self.play_music()
+
+    def play_music(self):
+        self.audio.music.play(self.music_file)
+
+    def start_game(self, start_level=1, endless=False):
+        self.scenes.push(Game(start_level=start_level, scenes=self.scenes, endless=endless))
 
     def load_progress(self):
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -91,7 +73,7 @@ class Menu:
             try:
                 with open(save_path, 'r') as f:
                     level = int(f.read())
-                    if 1 <= level <= 3:
+                    if 1 <= level <= len(level_files()):
                         return level
             except Exception as e:
                 print(f"Error al leer el archivo de guardado: {e}")
@@ -107,33 +89,30 @@ class Menu:
 
         if hovered and text not in self.hovered_buttons:
             self.hovered_buttons.add(text)
-            if self.hover_sound:
-                self.hover_sound.play()
+            self.audio.play('hover')
         elif not hovered:
             self.hovered_buttons.discard(text)
 
         if hovered:
             pygame.draw.rect(self.screen, hover_bg_color, rect, border_radius=8)
             pygame.draw.rect(self.screen, border_color, rect, 3, border_radius=8)
-            rendered_text = font.render(text, True, hover_text_color)
+            rendered_text = text_cache.render(font, text, hover_text_color)
         else:
             pygame.draw.rect(self.screen, bg_color, rect, border_radius=8)
             pygame.draw.rect(self.screen, border_color, rect, 3, border_radius=8)
-            rendered_text = font.render(text, True, text_color)
+            rendered_text = text_cache.render(font, text, text_color)
 
         text_rect = rendered_text.get_rect(center=rect.center)
         self.screen.blit(rendered_text, text_rect)
         return rect
 
     def draw_text(self, text, x, y, font, color=(255, 255, 255)):
-        text_surface = font.render(text, True, color)
+        text_surface = text_cache.render(font, text, color)
         text_rect = text_surface.get_rect(center=(x, y))
         self.screen.blit(text_surface, text_rect)
 
     def draw_menu(self):
-        frame_surface = self.background_gif.blit_ready()
-        frame_surface = pygame.transform.scale(frame_surface, (self.screen_width, self.screen_height))
-        self.screen.blit(frame_surface, (0, 0))
+        self.screen.blit(self.background_gif.frame(), (0, 0))
         
         if self.state != "sound":
             self.screen.blit(self.title, (self.screen_width // 2 - self.title.get_width() // 2, 80))
@@ -145,14 +124,15 @@ class Menu:
             if self.saved_level is not None:
                 continue_button = self.draw_button("Continuar", 400, 240, self.font, mouse_pos)
                 buttons.append(continue_button)
-                y_start = 320
+                y_start = 310
             else:
                 y_start = 260
 
             play_button = self.draw_button("Iniciar Juego", 400, y_start, self.font, mouse_pos)
-            options_button = self.draw_button("Opciones", 400, y_start + 80, self.font, mouse_pos)
-            quit_button = self.draw_button("Salir", 400, y_start + 160, self.font, mouse_pos)
-            buttons.extend([play_button, options_button, quit_button])
+            endless_button = self.draw_button("Modo infinito", 400, y_start + 70, self.font, mouse_pos)
+            options_button = self.draw_button("Opciones", 400, y_start + 140, self.font, mouse_pos)
+            quit_button = self.draw_button("Salir", 400, y_start + 210, self.font, mouse_pos)
+            buttons.extend([play_button, endless_button, options_button, quit_button])
             return buttons
 
         elif self.state == "options":
@@ -184,7 +164,7 @@ class Menu:
                 pygame.draw.rect(self.screen, (255, 255, 255), self.knobs[key])
 
             # Botón mute
-            mute_text = "Activar sonido" if self.muted else "Silenciar"
+            mute_text = "Activar sonido" if self.audio.muted else "Silenciar"
             mute_button = self.draw_button(mute_text, 400, 470, self.small_font, mouse_pos, w=200, h=50)
             # Botón volver
             back_button = self.draw_button("Volver", 400, 530, self.small_font, mouse_pos, w=200, h=40)
@@ -211,8 +191,8 @@ class Menu:
             line_spacing = 40
             for i, (key, action) in enumerate(controls_list):
                 y = start_y + i * line_spacing
-                key_text = self.small_font.render(key, True, (255, 255, 255))
-                action_text = self.small_font.render(action, True, (200, 200, 200))
+                key_text = text_cache.render(self.small_font, key, (255, 255, 255))
+                action_text = text_cache.render(self.small_font, action, (200, 200, 200))
                 self.screen.blit(key_text, (overlay_rect.left + 40, y))
                 self.screen.blit(action_text, (overlay_rect.left + 320, y))
 
@@ -220,62 +200,23 @@ class Menu:
             return (back_button,)
 
     def get_volume(self, key):
-        if key == "general":
-            return self.volume_general
-        elif key == "musica":
-            return self.volume_musica
-        elif key == "efectos":
-            return self.volume_efectos
-        return 0
+        return self.audio.get_volume(key)
 
     def set_volume(self, key, value):
-        value = max(0, min(1, value))
-        if key == "general":
-            self.volume_general = value
-        elif key == "musica":
-            self.volume_musica = value
-        elif key == "efectos":
-            self.volume_efectos = value
-        self.apply_volumes()
-
-    def apply_volumes(self):
-        # Música (mixer.music) se controla con volumen general * volumen música
-        pygame.mixer.music.set_volume(self.volume_general * self.volume_musica)
-
-        # Sonidos hover y click se controlan con volumen general * volumen efectos
-        if self.hover_sound:
-            self.hover_sound.set_volume(self.volume_general * self.volume_efectos)
-        if self.click_sound:
-            self.click_sound.set_volume(self.volume_general * self.volume_efectos)
+        self.audio.set_volume(key, value)
 
     def toggle_mute(self):
-        if self.muted:
-            # Restaurar volúmenes
-            self.volume_general = self.saved_volumes["general"]
-            self.volume_musica = self.saved_volumes["musica"]
-            self.volume_efectos = self.saved_volumes["efectos"]
-            self.muted = False
-        else:
-            # Guardar y silenciar todo
-            self.saved_volumes["general"] = self.volume_general
-            self.saved_volumes["musica"] = self.volume_musica
-            self.saved_volumes["efectos"] = self.volume_efectos
-
-            self.volume_general = 0
-            self.volume_musica = 0
-            self.volume_efectos = 0
-            self.muted = True
+        self.audio.toggle_mute()
         self.update_sliders()
-        self.apply_volumes()
 
     def update_sliders(self):
-        self.knobs["general"].x = self.sliders["general"].x + int(self.volume_general * self.slider_width) - 5
-        self.knobs["musica"].x = self.sliders["musica"].x + int(self.volume_musica * self.slider_width) - 5
-        self.knobs["efectos"].x = self.sliders["efectos"].x + int(self.volume_efectos * self.slider_width) - 5
+        for key, knob in self.knobs.items():
+            knob.x = self.sliders[key].x + int(self.get_volume(key) * self.slider_width) - 5
 
     def run(self):
-        while True:
+        while self.scenes.current is self:
             self.clock.tick(60)
+            self.audio.update()
             buttons = self.draw_menu()
             pygame.display.flip()
 
@@ -290,29 +231,23 @@ class Menu:
                 
                     if self.state == "menu":
                         if self.saved_level is not None and buttons[0].collidepoint(mouse_pos):
-                            if self.click_sound:
-                                self.click_sound.play()
-                            pygame.mixer.music.stop()
-                            game = Game()
-                            game.current_level = self.saved_level
-                            game.load_level_background()
-                            game.create_enemies()  # Esta línea ya crea los escudos si el nivel lo requiere
-                            game.run()
-                            continue
+                            self.audio.play('click')
+                            self.start_game(self.saved_level)
+                            return
                         
                         if buttons[button_offset].collidepoint(mouse_pos):
-                            if self.click_sound:
-                                self.click_sound.play()
-                            pygame.mixer.music.stop()
-                            game = Game()
-                            game.run()
+                            self.audio.play('click')
+                            self.start_game()
+                            return
                         elif buttons[button_offset + 1].collidepoint(mouse_pos):
-                            if self.click_sound:
-                                self.click_sound.play()
-                            self.state = "options"
+                            self.audio.play('click')
+                            self.start_game(endless=True)
+                            return
                         elif buttons[button_offset + 2].collidepoint(mouse_pos):
-                            if self.click_sound:
-                                self.click_sound.play()
+                            self.audio.play('click')
+                            self.state = "options"
+                        elif buttons[button_offset + 3].collidepoint(mouse_pos):
+                            self.audio.play('click')
                             pygame.quit()
                             sys.exit()
                 
@@ -326,8 +261,7 @@ class Menu:
 
                     elif self.state == "sound":
                         if buttons[0].collidepoint(mouse_pos):  # Botón de mute
-                            if self.click_sound:
-                                self.click_sound.play()
+                            self.audio.play('click')
                             self.toggle_mute()
                         elif buttons[1].collidepoint(mouse_pos):  # Botón de volver
                             self.state = "options"
@@ -0,0 +1,28 @@
+from .assets import sprite_cache
+
+
+class LevelPrefetcher:
+    """Prepara en segundo plano los recursos de un nivel según su plan en `LevelManager.levels`.
+
+    Las imágenes (fondo, enemigos, escudos...) se leen y escalan en los hilos de
+    `sprite_cache`, y la música se decodifica en el hilo del `MusicPlayer`. Al cambiar
+    de nivel `sprite_cache.load` y `MusicPlayer.play` recogen lo ya preparado.
+    """
+
+    def __init__(self, level_manager, music=None):
+        self.level_manager = level_manager
+        self.music = music
+        self.prefetched = set()
+
+    def prefetch(self, level):
+        if level in self.prefetched or self.level_manager.plan(level) is None:
+            return
+        self.prefetched.add(level)
+        sprite_cache.prefetch(self.level_manager.level_images(level))
+        if self.music:
+            self.music.prefetch(self.level_manager.get_level_music(level))
+
+    def retain_music(self, levels):
+        """Conserva decodificadas solo las pistas de `levels`; el resto se libera."""
+        if self.music:
+            self.music.retain(self.level_manager.get_level_music(level) for level in levels)
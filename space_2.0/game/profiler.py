@@ -0,0 +1,87 @@
+import pygame
+import time
+from collections import deque
+
+
+class FrameProfiler:
+    """Perfilador por fases del bucle principal, con overlay activable (F3).
+
+    Cuando está desactivado, `lap` y `end_frame` retornan de inmediato, así que
+    el coste en el bucle es una llamada y una comprobación por fase.
+    """
+
+    PHASES = ('handle_events', 'update', 'check_collisions', 'draw', 'flip')
+
+    def __init__(self, history=120):
+        self.enabled = False
+        self.history = history
+        self.frame_times = deque(maxlen=history)
+        self.phase_times = {phase: deque(maxlen=history) for phase in self.PHASES}
+        self.current = {}
+        self.last = 0.0
+        self.frame_start = 0.0
+        self.font = None
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame_times.clear()
+        for times in self.phase_times.values():
+            times.clear()
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last = time.perf_counter()
+        self.current = dict.fromkeys(self.PHASES, 0.0)
+
+    def lap(self, phase):
+        """Atribuye a `phase` el tiempo transcurrido desde la última marca."""
+        if not self.enabled or not self.current:
+            return
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled or not self.current:
+            return
+        self.frame_times.append(time.perf_counter() - self.frame_start)
+        for phase, elapsed in self.current.items():
+            self.phase_times[phase].append(elapsed)
+
+    def average(self, phase):
+        times = self.phase_times[phase]
+        return sum(times) / len(times) if times else 0.0
+
+    def draw(self, screen, counts):
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont(None, 20)
+
+        # Gráfica de tiempos de frame (la línea marca 16,7 ms = 60 FPS)
+        graph_height = 60
+        width = 260
+        panel = pygame.Surface((width, graph_height + 8 + 16 * (1 + len(self.PHASES) + len(counts))),
+                               pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        budget_y = graph_height - int(graph_height * (1000 / 60) / 33.3)
+        pygame.draw.line(panel, (80, 80, 80), (0, budget_y), (width, budget_y))
+        for i, frame_time in enumerate(self.frame_times):
+            ms = frame_time * 1000
+            bar = min(graph_height, int(graph_height * ms / 33.3))
+            color = (0, 220, 0) if ms <= 1000 / 60 else (240, 60, 60)
+            x = width - len(self.frame_times) * 2 + i * 2
+            pygame.draw.line(panel, color, (x, graph_height), (x, graph_height - bar))
+
+        frames = len(self.frame_times)
+        avg = sum(self.frame_times) / frames * 1000 if frames else 0.0
+        lines = [f"frame {avg:6.2f} ms ({1000 / avg if avg else 0:5.1f} FPS)"]
+        lines += [f"  {phase:<17}{self.average(phase) * 1000:6.2f} ms" for phase in self.PHASES]
+        lines += [f"{name}: {value}" for name, value in counts.items()]
+        y = graph_height + 4
+        for line in lines:
+            panel.blit(self.font.render(line, True, (255, 255, 255)), (6, y))
+            y += 16
+
+        screen.blit(panel, (screen.get_width() - width - 10, 50))
@@ -0,0 +1,80 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """Presentación por rectángulos sucios para la pantalla de juego.
+
+    Cada frame se restaura el fondo solo bajo los rectángulos dibujados en el
+    frame anterior, se registran los nuevos y se envían ambos con
+    `display.update(rects)`. Si la zona sucia supera `max_dirty_fraction` de
+    la pantalla (o no se conocen los rectángulos) se vuelve a un flip completo.
+    """
+
+    def __init__(self, screen, max_dirty_fraction=0.6):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.max_dirty_area = self.screen_rect.width * self.screen_rect.height * max_dirty_fraction
+        self.background = None
+        self.previous = None  # rectángulos del frame anterior; None = hay que redibujar todo
+        self.rects = []
+        self.area = 0
+        self.full = True
+        self.untracked = False
+        self.overlay = False
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def begin(self, background, full=False):
+        """Prepara el frame: fondo completo o solo bajo los rectángulos del frame anterior.
+
+        `full=True` indica un frame con capas superpuestas que no registran sus
+        rectángulos (menús, perfilador): el frame siguiente también será completo.
+        """
+        self.rects = []
+        self.area = 0
+        self.untracked = False
+        self.overlay = full
+        self.full = full or self.previous is None or background is not self.background
+        self.background = background
+
+        if self.full:
+            self._restore(self.screen_rect)
+            return
+        for rect in self.previous:
+            self._restore(rect)
+            self.area += rect.width * rect.height
+
+    def _restore(self, rect):
+        if self.background:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill((0, 0, 0), rect)
+
+    def add(self, rect):
+        if rect is None:
+            return
+        rect = rect.clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+            self.area += rect.width * rect.height
+
+    def fits(self, area):
+        """Indica si añadir `area` píxeles sucios mantiene el frame por debajo del umbral."""
+        return self.area + area <= self.max_dirty_area
+
+    def add_untracked(self):
+        """Se dibujó algo sin registrar sus rectángulos: este frame y el siguiente serán completos."""
+        self.untracked = True
+
+    def invalidate(self):
+        """La pantalla se dibujó por otra vía (p. ej. la pausa congelada): el siguiente frame será completo."""
+        self.previous = None
+
+    def present(self):
+        if self.full or self.untracked or self.area > self.max_dirty_area:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(self.previous + self.rects)
+            self.partial_frames += 1
+        self.previous = None if self.untracked or self.overlay else self.rects
@@ -0,0 +1,117 @@
+import json
+import zlib
+import base64
+from .input import InputState
+
+# Bits de cada tick en el registro de entrada
+_LEFT = 1
+_RIGHT = 2
+_SHOOT = 4
+_PAUSE = 8
+
+
+class ReplayDesyncError(Exception):
+    """La repetición no reproduce el mismo estado que la partida grabada."""
+
+
+def encode_state(state):
+    return ((_LEFT if state.left else 0) | (_RIGHT if state.right else 0)
+            | (_SHOOT if state.shoot else 0) | (_PAUSE if state.pause else 0))
+
+
+def decode_state(value):
+    return InputState(bool(value & _LEFT), bool(value & _RIGHT),
+                      bool(value & _SHOOT), bool(value & _PAUSE))
+
+
+class Replay:
+    """Semilla, nivel inicial, modo, un byte de entrada por tick y el hash de estado al final de cada nivel."""
+
+    def __init__(self, seed, start_level=1, inputs=None, checkpoints=None, endless=False):
+        self.seed = seed
+        self.start_level = start_level
+        self.endless = endless  # partida del modo infinito (oleadas en lugar de levels/)
+        self.inputs = bytearray(inputs or b'')
+        self.checkpoints = dict(checkpoints or {})  # nivel -> hash de estado
+
+    def save(self, path):
+        data = {
+            'seed': self.seed,
+            'start_level': self.start_level,
+            'endless': self.endless,
+            'inputs': base64.b64encode(zlib.compress(bytes(self.inputs))).decode('ascii'),
+            'checkpoints': {str(level): h for level, h in self.checkpoints.items()},
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(
+            data['seed'],
+            data.get('start_level', 1),
+            zlib.decompress(base64.b64decode(data['inputs'])),
+            {int(level): h for level, h in data.get('checkpoints', {}).items()},
+            data.get('endless', False),
+        )
+
+
+class RecordingInput:
+    """Envuelve otra fuente de entrada y graba cada tick en un Replay."""
+
+    def __init__(self, source, replay):
+        self.source = source
+        self.replay = replay
+
+    def press(self, key):
+        self.source.press(key)
+
+    def poll(self):
+        state = self.source.poll()
+        self.replay.inputs.append(encode_state(state))
+        return state
+
+    def checkpoint(self, level, state_hash):
+        self.replay.checkpoints[level] = state_hash
+
+
+class ReplayInput:
+    """Reproduce la entrada de un Replay y comprueba los hashes al final de cada nivel."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.position = 0
+
+    @property
+    def finished(self):
+        return self.position >= len(self.replay.inputs)
+
+    def press(self, key):
+        pass
+
+    def poll(self):
+        if self.finished:
+            return InputState()
+        value = self.replay.inputs[self.position]
+        self.position += 1
+        return decode_state(value)
+
+    def checkpoint(self, level, state_hash):
+        expected = self.replay.checkpoints.get(level)
+        if expected is not None and expected != state_hash:
+            raise ReplayDesyncError(
+                f"Nivel {level}: hash {state_hash} distinto del grabado {expected} (tick {self.position})"
+            )
+
+
+def play_replay(replay, headless=True):
+    """Vuelve a simular una partida grabada tick a tick y devuelve el Game resultante."""
+    from .game import Game
+
+    game = Game(headless=headless, seed=replay.seed, start_level=replay.start_level,
+                input_source=ReplayInput(replay), endless=replay.endless)
+    while not game.input.finished and not (game.game_over or game.victory):
+        game.update()
+    return game
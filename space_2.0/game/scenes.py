@@ -0,0 +1,53 @@
+import pygame
+from .assets import sprite_cache
+from .hud import text_cache
+from .audio import AudioService
+
+
+class SceneManager:
+    """Pila de escenas (menú, partida...) que comparten una única ventana, el audio y las cachés.
+
+    Cada escena tiene un método `run()` que vuelve en cuanto deja de estar en la cima
+    de la pila; el gestor ejecuta entonces la nueva cima. Así pasar del menú a la partida
+    y volver no anida llamadas ni vuelve a crear la ventana o a cargar recursos.
+    """
+
+    def __init__(self, screen_width=800, screen_height=600, caption="Invasión Espacial"):
+        pygame.init()
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.screen = pygame.display.set_mode((screen_width, screen_height))
+        pygame.display.set_caption(caption)
+        self.audio = AudioService()
+        self.clock = pygame.time.Clock()
+        self.sprite_cache = sprite_cache
+        self.text_cache = text_cache
+        self.stack = []
+
+    @property
+    def current(self):
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene):
+        self.stack.append(scene)
+        self._enter(scene)
+
+    def pop(self):
+        scene = self.stack.pop()
+        if self.stack:
+            self._enter(self.stack[-1])
+        return scene
+
+    def replace(self, scene):
+        if self.stack:
+            self.stack.pop()
+        self.push(scene)
+
+    def _enter(self, scene):
+        on_enter = getattr(scene, 'on_enter', None)
+        if on_enter:
+            on_enter()
+
+    def run(self):
+        while self.stack:
+            self.current.run()
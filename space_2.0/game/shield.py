@@ -1,78 +1,90 @@
 import pygame
-import os
 import math
+from .assets import sprite_cache, tinted
+from .timestep import FIXED_DT, TICK_RATE, countdown
+
+SHIELD_IMAGE = 'block.jpeg'
+SHIELD_SIZE = (60, 30)
+GLOW_FRAMES = TICK_RATE  # un fotograma de brillo por tick del ciclo de 1 segundo
 
 class Shield:
-    def __init__(self, x, y, width=60, height=30, life=10, indestructible=False):
-        # Cargar imagen del escudo
-        base_path = os.path.dirname(__file__)
-        image_path = os.path.join(base_path, '..', 'images', 'block.jpeg')  
-        try:
-            self.image = pygame.image.load(image_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (width, height))
-        except Exception as e:
-            print(f"Error cargando imagen de escudo: {e}")
-            # Fallback: crear superficie con color
-            self.image = pygame.Surface((width, height), pygame.SRCALPHA)
-            pygame.draw.rect(self.image, (0, 255, 0, 128), (0, 0, width, height))
+    def __init__(self, x, y, width=SHIELD_SIZE[0], height=SHIELD_SIZE[1], life=10, indestructible=False):
+        # Imagen del escudo compartida entre todos los escudos del mismo tamaño; como en
+        # Enemy, se pide a la caché al dibujar por primera vez para que crear el nivel no
+        # espere a la lectura en segundo plano
+        self.image = None
+        self.size = (width, height)
         
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.rect = pygame.Rect(x, y, width, height)
         self.max_life = life
         self.life = life
         self.indestructible = indestructible  # Nuevo atributo
-        self.damage_timer = 0
-        self.glow_timer = 0  # Para efecto de brillo en escudos indestructibles
+        self.damage_timer = 0.0  # segundos de parpadeo tras recibir daño
+        self.glow_timer = 0.0  # Para efecto de brillo en escudos indestructibles (segundos)
 
     def take_damage(self):
         """Reduce la vida del escudo a menos que sea indestructible"""
         if not self.indestructible:
             self.life -= 1
-            self.damage_timer = 10
+            self.damage_timer = 1 / 6
 
     def is_destroyed(self):
         """Determina si el escudo debe ser eliminado"""
         return self.life <= 0 and not self.indestructible
 
-    def update(self):
+    def update(self, dt=FIXED_DT):
         """Actualiza temporizadores para efectos visuales"""
-        if self.damage_timer > 0:
-            self.damage_timer -= 1
+        self.damage_timer = countdown(self.damage_timer, dt)
         
         if self.indestructible:
-            self.glow_timer = (self.glow_timer + 1) % 60  # Ciclo de 60 frames
+            self.glow_timer = (self.glow_timer + dt) % 1.0  # Ciclo de 1 segundo
+
+    def damage_frame(self):
+        key = ('shield_damage', SHIELD_IMAGE, self.size)
+        return sprite_cache.build(key, lambda: tinted(self.image, (255, 0, 0, 100), pygame.BLEND_RGBA_MULT))
+
+    def life_frame(self):
+        """Escudo con transparencia según la vida; una superficie por valor de vida."""
+        life = max(self.life, 0)
+        if life >= self.max_life:
+            return self.image
+        key = ('shield_life', SHIELD_IMAGE, self.size, life, self.max_life)
+        alpha = int(255 * (life / self.max_life))
+        return sprite_cache.build(key, lambda: tinted(self.image, (255, 255, 255, alpha), pygame.BLEND_RGBA_MULT))
+
+    def glow_frame(self):
+        """Fotograma del anillo de brillo pulsante (borde dorado + escudo aclarado)."""
+        index = round(self.glow_timer * GLOW_FRAMES) % GLOW_FRAMES
+        key = ('shield_glow', SHIELD_IMAGE, self.size, index)
+        return sprite_cache.build(key, lambda: self._render_glow(index))
+
+    def _render_glow(self, index):
+        glow_intensity = 0.5 + 0.5 * abs(math.sin(index * 0.1))  # Efecto pulsante
+        width, height = self.size
+
+        # Borde dorado
+        frame = pygame.Surface((width + 6, height + 6), pygame.SRCALPHA)
+        pygame.draw.rect(frame, (255, 215, 0, int(200 * glow_intensity)),
+                         (0, 0, frame.get_width(), frame.get_height()), 3)
+
+        # Escudo con brillo
+        frame.blit(tinted(self.image, (255, 255, 255, int(50 * glow_intensity)), pygame.BLEND_RGBA_ADD), (3, 3))
+        return frame
 
     def draw(self, screen):
-        """Dibuja el escudo con efectos visuales apropiados"""
+        """Dibuja el escudo con efectos visuales apropiados usando fotogramas precalculados"""
+        if self.image is None:
+            self.image = sprite_cache.load(SHIELD_IMAGE, self.size, fallback_color=(0, 255, 0))
         # Efecto de daño visual (parpadeo rojo)
         if self.damage_timer > 0:
-            if self.damage_timer % 2 == 0:  # Parpadeo cada 2 frames
-                tinted = self.image.copy()
-                tinted.fill((255, 0, 0, 100), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(tinted, self.rect)
-                return
-        
-        # Dibujar base del escudo
+            if round(self.damage_timer * TICK_RATE) % 2 == 0:  # Parpadeo cada 2 ticks
+                screen.blit(self.damage_frame(), self.rect)
+                return self.rect.inflate(6, 6)
+
         if self.indestructible:
-            # Efecto especial para escudos indestructibles
-            glow_intensity = 0.5 + 0.5 * abs(math.sin(self.glow_timer * 0.1))  # Efecto pulsante
-            
-            # Borde dorado
-            border = pygame.Surface((self.rect.width + 6, self.rect.height + 6), pygame.SRCALPHA)
-            pygame.draw.rect(border, (255, 215, 0, int(200 * glow_intensity)), 
-                           (0, 0, border.get_width(), border.get_height()), 3)
-            screen.blit(border, (self.rect.x - 3, self.rect.y - 3))
-            
-            # Escudo con brillo
-            shield_img = self.image.copy()
-            shield_img.fill((255, 255, 255, int(50 * glow_intensity)), 
-                          special_flags=pygame.BLEND_RGBA_ADD)
-            screen.blit(shield_img, self.rect)
+            screen.blit(self.glow_frame(), (self.rect.x - 3, self.rect.y - 3))
         else:
             # Escudo normal con transparencia basada en la vida
-            alpha = int(255 * (self.life / self.max_life))
-            if alpha < 255:
-                temp_img = self.image.copy()
-                temp_img.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(temp_img, self.rect)
-            else:
-                screen.blit(self.image, self.rect)
\ No newline at end of file
+            screen.blit(self.life_frame(), self.rect)
+        # Zona afectada, incluido el borde dorado de los indestructibles
+        return self.rect.inflate(6, 6)
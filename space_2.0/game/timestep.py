@@ -0,0 +1,45 @@
+# Simulación a paso fijo: la lógica avanza siempre en ticks de FIXED_DT segundos,
+# independientemente de la frecuencia de refresco con la que se dibuje.
+TICK_RATE = 60
+FIXED_DT = 1.0 / TICK_RATE
+MAX_FRAME_TIME = 0.25  # evita la "espiral de la muerte" tras un parón largo
+EPSILON = 1e-6         # absorbe el error de redondeo al acumular FIXED_DT
+
+
+class FixedTimestep:
+    """Acumulador de tiempo real que decide cuántos ticks de simulación ejecutar por frame."""
+
+    def __init__(self, dt=FIXED_DT, max_frame_time=MAX_FRAME_TIME):
+        self.dt = dt
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Añade el tiempo real del frame y devuelve cuántos ticks hay que simular."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        ticks = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            ticks += 1
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fracción del siguiente tick ya transcurrida, para interpolar el dibujo."""
+        return self.accumulator / self.dt
+
+
+def countdown(timer, dt=FIXED_DT):
+    """Resta `dt` a un temporizador en segundos sin bajar de cero."""
+    timer -= dt
+    return timer if timer > EPSILON else 0.0
+
+
+def interpolate(entity, alpha):
+    """Posición de dibujo entre la del tick anterior (`prev_pos`) y la actual."""
+    x, y = entity.rect.topleft
+    prev = getattr(entity, 'prev_pos', None)
+    if prev is None or alpha >= 1.0:
+        return x, y
+    return (round(prev[0] + (x - prev[0]) * alpha),
+            round(prev[1] + (y - prev[1]) * alpha))
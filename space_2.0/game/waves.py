@@ -0,0 +1,150 @@
+import random
+from .enemy import Enemy, FinalBoss
+from .level_files import LevelPlan, SpawnGroup
+from .shield import SHIELD_SIZE
+
+# Tope de enemigos por oleada: los que caben en la zona de la formación con el sprite mínimo
+MAX_WAVE_ENEMIES = 2000
+MIN_SPRITE_WIDTH = 8
+BOSS_EVERY = 5
+
+# Fondo y música por oleada; las oleadas con jefe usan siempre el último par
+STAGES = (
+    ('lvl1.png', 'musica_nivel1.mp3'),
+    ('lvl2.png', 'musica_nivel2.mp3'),
+    ('lvl3.png', 'musica_jefe_final.mp3'),
+)
+
+# Cadencia base (disparos/s, sin escalar por nivel) de cada tipo de la rejilla
+_BASE_FIRE_RATES = {'basic': 0.24, 'strong': 0.48, 'radial': 0.6}
+
+
+class WaveGenerator:
+    """Oleadas infinitas generadas a partir de una semilla.
+
+    La oleada `n` depende solo de la semilla y de `n` (cada una usa su propio
+    `random.Random`), así que se puede generar en cualquier orden y una partida
+    con la misma semilla ve siempre las mismas oleadas. La dificultad sube con:
+
+    - el número de enemigos (x1,4 por oleada hasta `MAX_WAVE_ENEMIES`); los sprites
+      se encogen para que la formación quepa siempre en la misma zona,
+    - la mezcla de tipos (más fuertes y, desde la 3, radiales; jefe cada `BOSS_EVERY`),
+    - el fuego: los disparos por segundo de toda la formación crecen linealmente y
+      se reparten entre sus miembros, de modo que las balas vivas no escalan con
+      el número de enemigos,
+    - los peligros: nubes desde la oleada 3 y satélites desde la 6.
+    """
+
+    def __init__(self, seed, screen_width, screen_height):
+        self.seed = seed
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+
+    @staticmethod
+    def enemy_count(wave):
+        return min(MAX_WAVE_ENEMIES, round(12 * 1.4 ** (wave - 1)))
+
+    @staticmethod
+    def fire_budget(wave):
+        """Disparos por segundo de toda la formación (sin contar al jefe)."""
+        return 2.0 + 0.6 * wave
+
+    def plan(self, wave):
+        rng = random.Random(f"{self.seed}:{wave}")
+        boss_wave = wave % BOSS_EVERY == 0
+        groups = []
+        if boss_wave:
+            boss_x = (self.screen_width - FinalBoss.IMAGE_SIZE[0]) // 2
+            groups.append(SpawnGroup(['boss'], [(boss_x, 40)], bullet_speed=6,
+                                     lives=20 + 4 * (wave // BOSS_EVERY - 1)))
+            top, height, count = 40 + FinalBoss.IMAGE_SIZE[1] + 10, 140, self.enemy_count(wave) // 2
+        else:
+            top, height, count = 60, 280, self.enemy_count(wave)
+
+        size, positions = self._layout(count, top, height)
+        # Pesos de la mezcla: los fuertes y los radiales ganan peso con cada oleada
+        weights = {
+            'basic': 1.0,
+            'strong': min(1.0, 0.15 * (wave - 1)),
+            'radial': min(0.5, 0.05 * (wave - 2)) if wave >= 3 else 0.0,
+        }
+        names = [name for name, weight in weights.items() if weight > 0]
+        types = rng.choices(names, [weights[name] for name in names], k=len(positions))
+
+        # Reparto del presupuesto de fuego en proporción a la cadencia base de cada tipo
+        total_rate = sum(_BASE_FIRE_RATES[name] for name in types)
+        scale = self.fire_budget(wave) / total_rate if total_rate else 0.0
+        bullet_speed = 2 + min(4.0, 0.25 * wave)
+        for name in names:
+            cells = [position for position, kind in zip(positions, types) if kind == name]
+            if cells:
+                groups.append(SpawnGroup([name] * len(cells), cells, bullet_speed=bullet_speed,
+                                         fire_rate=_BASE_FIRE_RATES[name] * scale, size=size))
+
+        spacing = self.screen_width // 4
+        shields = [(spacing * (i + 1) - SHIELD_SIZE[0] // 2, self.screen_height - 150, False)
+                   for i in range(3)]
+        background, music = STAGES[-1] if boss_wave else STAGES[(wave - 1) // 2 % 2]
+        return LevelPlan(background, music, wave >= 3, wave >= 6, shields, groups)
+
+    def _layout(self, count, top, height):
+        """Tamaño de sprite más grande con el que `count` enemigos caben en la zona, y sus posiciones.
+
+        La zona ocupa el 85 % del ancho para dejar recorrido lateral a la formación;
+        se rellena por filas desde arriba y cada fila queda centrada.
+        """
+        width = int(self.screen_width * 0.85)
+        base_w, base_h = Enemy.IMAGE_SIZE
+        for sprite_w in range(base_w, MIN_SPRITE_WIDTH - 1, -1):
+            sprite_h = max(1, round(sprite_w * base_h / base_w))
+            cell_w = sprite_w + max(2, sprite_w // 5)
+            cell_h = sprite_h + max(2, sprite_h // 5)
+            cols = width // cell_w
+            if cols and cols * (height // cell_h) >= count:
+                break
+        cols = min(cols, count)
+        count = min(count, cols * (height // cell_h))
+        left = (self.screen_width - cols * cell_w) // 2
+        positions = [(left + (i % cols) * cell_w, top + (i // cols) * cell_h) for i in range(count)]
+        size = None if sprite_w == base_w else (sprite_w, sprite_h)
+        return size, positions
+
+
+class WaveStats:
+    """FPS sostenidos de cada oleada, medidos con el tiempo real entre frames.
+
+    `frame(frame_time)` se llama una vez por frame jugado (sin pausas ni menús) y
+    `finish` cierra la oleada y devuelve su informe: FPS medios (frames / tiempo),
+    el percentil 99 del tiempo de frame y el peor frame. Sin frames medidos (simulación
+    sin dibujo, repeticiones) no hay informe.
+    """
+
+    def __init__(self):
+        self.frame_times = []
+        self.reports = []
+
+    def frame(self, frame_time):
+        self.frame_times.append(frame_time)
+
+    def finish(self, wave, enemies):
+        times = sorted(self.frame_times)
+        if not times:
+            return None
+        elapsed = sum(times)
+        report = {
+            'wave': wave,
+            'enemies': enemies,
+            'frames': len(times),
+            'fps': len(times) / elapsed if elapsed else 0.0,
+            'p99_ms': times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+            'max_ms': times[-1] * 1000,
+        }
+        self.reports.append(report)
+        self.frame_times = []
+        return report
+
+    @staticmethod
+    def format(report):
+        return (f"Oleada {report['wave']}: {report['enemies']} enemigos, "
+                f"{report['fps']:.1f} FPS sostenidos (p99 {report['p99_ms']:.1f} ms, "
+                f"peor {report['max_ms']:.1f} ms, {report['frames']} frames)")
@@ -1,5 +1,7 @@
+from game.scenes import SceneManager
 from game.menu import Menu
 
 if __name__ == "__main__":
-    menu = Menu()
-    menu.run()
\ No newline at end of file
+    scenes = SceneManager()
+    scenes.push(Menu(scenes))
+    scenes.run()